@@ -0,0 +1,230 @@
+"""
+Benchmark of XboxOne refreshes and commands against a local fake REST server.
+
+Starts benchmarks/fake_server.py in a child process, creates one XboxOne per
+console on a real (but otherwise empty) Home Assistant instance and reports,
+per console count:
+
+- requests per poll, per endpoint template
+- CPU time per poll spent by the integration (the server runs elsewhere)
+- p50/p99 refresh latency
+- p50/p99 command latency
+- executor jobs and threads used
+- memory retained per console and, with --metrics, JSON parse time and
+  unchanged responses per endpoint template
+
+Run from the repository root with benchmarks/requirements.txt installed:
+
+    python benchmarks/bench_refresh.py --consoles 1 10 100 --latency 0.01
+
+Pass --etag to have the server answer conditional requests with 304, without
+it unchanged responses are detected by their body hash.
+
+With --push N, push mode is enabled and N media status deltas are sent over
+each console's event stream after the polls. Reported are the listener
+notifications (half of the deltas change nothing), delivery latency, CPU time
+per delta and the HTTP requests made meanwhile.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from benchmarks.fake_server import FakeServerProcess  # noqa: E402
+from custom_components.xboxone import media_player  # noqa: E402
+
+
+def percentile(samples, pct):
+    if not samples:
+        return float("nan")
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+class ExecutorProbe:
+    """Counts jobs handed to the event loop's executor"""
+
+    def __init__(self, loop):
+        self.jobs = 0
+        self._loop = loop
+        self._run_in_executor = loop.run_in_executor
+        loop.run_in_executor = self._count
+
+    def _count(self, executor, func, *args):
+        self.jobs += 1
+        return self._run_in_executor(executor, func, *args)
+
+    @property
+    def threads(self):
+        executor = getattr(self._loop, "_default_executor", None)
+        return len(getattr(executor, "_threads", ()))
+
+
+async def timed(coro, samples):
+    started = time.perf_counter()
+    await coro
+    samples.append(time.perf_counter() - started)
+
+
+async def measure_push(server, xboxones, deltas):
+    """Drive push mode, returns notifications, latencies, CPU and requests"""
+    for xboxone in xboxones:
+        xboxone.async_start_push()
+    while server.push_connected < len(xboxones):
+        await asyncio.sleep(0.05)
+    server.reset_requests()
+
+    received = {xboxone.liveid: [] for xboxone in xboxones}
+    for xboxone in xboxones:
+        xboxone.async_add_listener(
+            lambda liveid=xboxone.liveid: received[liveid].append(time.time())
+        )
+
+    cpu_started = time.process_time()
+    sent = await server.push(deltas)
+    await asyncio.sleep(0.2)
+    cpu_per_delta = (time.process_time() - cpu_started) / (deltas * len(xboxones))
+
+    # Only the even deltas change the playback status
+    toggles = sent[::2]
+    samples = [
+        at - sent_at
+        for times in received.values()
+        for at, sent_at in zip(times, toggles)
+    ]
+    notifications = sum(len(times) for times in received.values())
+    for xboxone in xboxones:
+        await xboxone.async_stop_push()
+    return notifications, samples, cpu_per_delta, dict(server.requests)
+
+
+async def run(
+    consoles, polls, commands, latency, failure_rate, metrics, etag, push
+):
+    server = FakeServerProcess(
+        consoles, latency=latency, failure_rate=failure_rate, seed=0, etag=etag
+    )
+    base_url = await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        probe = ExecutorProbe(hass.loop)
+        kwargs = {"metrics": metrics, "push": bool(push)}
+        xboxones = [
+            media_player.XboxOne(hass, base_url, liveid, "", True, **kwargs)
+            for liveid in server.consoles
+        ]
+
+        # First poll fills caches, capability tables and the app catalog
+        await asyncio.gather(*(x.refresh() for x in xboxones))
+        await asyncio.sleep(0.1)
+        server.reset_requests()
+        probe.jobs = 0
+
+        refresh_samples = []
+        cpu_started = time.process_time()
+        for _ in range(polls):
+            await asyncio.gather(*(timed(x.refresh(), refresh_samples) for x in xboxones))
+        cpu_per_poll = (time.process_time() - cpu_started) / (polls * consoles)
+        poll_requests = dict(server.requests)
+        memory = xboxones[0].memory_usage
+        endpoints = {}
+        if metrics:
+            endpoints = xboxones[0].coordinator.metrics.as_dict()["endpoints"]
+
+        command_samples = []
+        for _ in range(commands):
+            await asyncio.gather(
+                *(
+                    timed(x.queue_command(x.media_command, "play_pause"), command_samples)
+                    for x in xboxones
+                )
+            )
+
+        if push:
+            push_results = await measure_push(server, xboxones, push)
+
+        await hass.async_stop(force=True)
+    await server.stop()
+
+    total = sum(poll_requests.values())
+    print(f"== {consoles} console(s), {polls} polls, {latency * 1000:.0f} ms latency")
+    print(f"requests per poll:  {total / (polls * consoles):6.2f}")
+    print(f"CPU per poll:       {cpu_per_poll * 1e6:8.1f} us")
+    for endpoint, count in sorted(poll_requests.items()):
+        print(f"  {endpoint:40} {count / (polls * consoles):6.2f}")
+    print(
+        f"refresh latency:    p50 {percentile(refresh_samples, 50) * 1000:7.2f} ms"
+        f"  p99 {percentile(refresh_samples, 99) * 1000:7.2f} ms"
+    )
+    print(
+        f"command latency:    p50 {percentile(command_samples, 50) * 1000:7.2f} ms"
+        f"  p99 {percentile(command_samples, 99) * 1000:7.2f} ms"
+    )
+    print(f"executor jobs:      {probe.jobs}  threads: {probe.threads}")
+    print(f"memory per console: {memory['total']:6d} bytes")
+    for name, size in sorted(memory.items()):
+        if name != "total":
+            print(f"  {name:40} {size:6d}")
+    if endpoints:
+        print("JSON parse time, unchanged responses:")
+        for endpoint, stats in sorted(endpoints.items()):
+            print(
+                f"  {endpoint:40} {stats['mean_parse_time'] * 1e6:8.2f} us"
+                f"  {stats['unchanged']:5d}/{stats['requests']}"
+            )
+    if push:
+        notifications, samples, cpu_per_delta, push_requests = push_results
+        print(f"push deltas:        {push * consoles}  notifications: {notifications}")
+        print(
+            f"push latency:       p50 {percentile(samples, 50) * 1000:7.2f} ms"
+            f"  p99 {percentile(samples, 99) * 1000:7.2f} ms"
+        )
+        print(f"CPU per delta:      {cpu_per_delta * 1e6:8.1f} us")
+        print(f"requests meanwhile: {sum(push_requests.values())}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--consoles", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--commands", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--metrics", action="store_true", help="enable request metrics"
+    )
+    parser.add_argument(
+        "--etag", action="store_true", help="server supports conditional requests"
+    )
+    parser.add_argument(
+        "--push", type=int, default=0, help="media status deltas to push"
+    )
+    args = parser.parse_args()
+
+    for consoles in args.consoles:
+        asyncio.run(
+            run(
+                consoles,
+                args.polls,
+                args.commands,
+                args.latency,
+                args.failure_rate,
+                args.metrics,
+                args.etag,
+                args.push,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
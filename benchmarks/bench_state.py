@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: cost of one Home Assistant state write of the media player.
+
+A state write reads the state, the supported features and every media player
+attribute of the entity. Run from the repository root with
+benchmarks/requirements.txt installed:
+
+    python benchmarks/bench_state.py
+"""
+import argparse
+import os
+import sys
+import timeit
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from custom_components.xboxone import media_player  # noqa: E402
+
+LIVEID = "FD00000000000000"
+
+
+def _title(index, has_focus=False):
+    return {
+        "name": f"App {index}",
+        "aum": f"Microsoft.App{index}_8wekyb3d8bbwe!App",
+        "type": "Application",
+        "image": f"https://store-images.s-microsoft.com/image/apps.{index}.png",
+        "has_focus": has_focus,
+        "title_id": 1000 + index,
+    }
+
+
+def build_entity(active_titles):
+    hass = SimpleNamespace(data={}, loop=None)
+    entity = media_player.XboxOneDevice(
+        hass, "http://localhost:5557", LIVEID, "", "Xbox", True
+    )
+    xboxone = entity._xboxone
+    xboxone._available = True
+    xboxone._connected = True
+    xboxone._console_status = {
+        "active_titles": [_title(i) for i in range(active_titles - 1)]
+        + [_title(active_titles - 1, has_focus=True)]
+    }
+    xboxone._media_status = {
+        "playback_status": "Playing",
+        "media_type": "Video",
+        "position": 1234567890,
+        "media_end": 9876543210,
+        "title_id": 1000 + active_titles - 1,
+        "aum_id": f"Microsoft.App{active_titles - 1}_8wekyb3d8bbwe!App",
+        "metadata": {"title": "Some Episode"},
+    }
+    xboxone._volume_controls = {
+        "tv": {
+            "buttons": {
+                "btn.vol_mute": {"url": f"/device/{LIVEID}/ir/tv/btn.vol_mute"},
+                "btn.vol_up": {"url": f"/device/{LIVEID}/ir/tv/btn.vol_up"},
+                "btn.vol_down": {"url": f"/device/{LIVEID}/ir/tv/btn.vol_down"},
+            }
+        }
+    }
+    xboxone._apps = {f"Pinned {i}": f"appx:Pinned{i}!App" for i in range(30)}
+
+    xboxone._snapshot = media_player.XboxOneState(xboxone)
+    return entity
+
+
+def state_write(entity):
+    entity.state
+    entity.supported_features
+    entity.capability_attributes
+    entity.state_attributes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--titles", type=int, default=3, help="active titles")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    entity = build_entity(args.titles)
+
+    per_write = min(
+        timeit.repeat(lambda: state_write(entity), number=args.number, repeat=5)
+    )
+    print(f"state write:    {per_write / args.number * 1e6:8.2f} us")
+
+    xboxone = entity._xboxone
+    per_build = min(
+        timeit.repeat(
+            lambda: media_player.XboxOneState(xboxone), number=args.number, repeat=5
+        )
+    )
+    print(f"snapshot build: {per_build / args.number * 1e6:8.2f} us (once per refresh)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Local stand-in for the SmartGlass REST server, used by the benchmarks.
+
+Implements the endpoints XboxOne talks to for any number of consoles, with
+configurable response latency and failure injection. Requests are counted
+per endpoint template, e.g. `/device/<liveid>/media_status`. With `etag`,
+responses carry an ETag and conditional requests are answered with 304.
+
+`/device/<liveid>/ws` is the event stream of push mode. push() sends media
+status deltas to every connected console, alternating between a playback
+change and a repeat of the current status.
+
+FakeServerProcess runs the server in a child process, so that its CPU time
+is not counted against the client.
+"""
+import asyncio
+from collections import Counter
+import hashlib
+import multiprocessing
+import random
+import time
+
+from aiohttp import web
+
+LIVEID_PREFIX = "FD"
+
+
+def liveid(index):
+    return f"{LIVEID_PREFIX}{index:014X}"
+
+
+class FakeSmartGlassServer:
+    def __init__(
+        self, consoles=1, latency=0.0, failure_rate=0.0, seed=None, etag=False
+    ):
+        self.consoles = [liveid(i) for i in range(consoles)]
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.etag = etag
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._sockets = {}
+        self._playing = True
+        self._runner = None
+        self.base_url = None
+
+        app = self._app = web.Application(middlewares=[self._middleware])
+        app.on_shutdown.append(self._close_sockets)
+        app.router.add_get("/versions", self._versions)
+        app.router.add_get("/auth", self._auth)
+        app.router.add_get("/auth/refresh", self._success)
+        app.router.add_get("/web/pins", self._pins)
+        app.router.add_get("/device", self._devices)
+        app.router.add_get("/device/{liveid}", self._device)
+        app.router.add_get("/device/{liveid}/connect", self._success)
+        app.router.add_get("/device/{liveid}/poweron", self._success)
+        app.router.add_get("/device/{liveid}/poweroff", self._success)
+        app.router.add_get("/device/{liveid}/console_status", self._console_status)
+        app.router.add_get("/device/{liveid}/media_status", self._media_status)
+        app.router.add_get("/device/{liveid}/ir", self._ir)
+        app.router.add_get("/device/{liveid}/ir/{device}/{button}", self._success)
+        app.router.add_get("/device/{liveid}/media", self._media)
+        app.router.add_get("/device/{liveid}/media/{command}", self._success)
+        app.router.add_get("/device/{liveid}/launch/{uri:.*}", self._success)
+        app.router.add_get("/device/{liveid}/ws", self._ws)
+
+    async def start(self, host="127.0.0.1", port=0):
+        self._runner = web.AppRunner(self._app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def push(self, count, interval=0.0):
+        """
+        Send count deltas to every connected console, returns the send times.
+
+        Even deltas toggle the playback status, odd ones repeat it and don't
+        change anything the entity shows.
+        """
+        sent = []
+        for index in range(count):
+            if index % 2 == 0:
+                self._playing = not self._playing
+            status = "Playing" if self._playing else "Paused"
+            sent.append(time.time())
+            for ws in list(self._sockets.values()):
+                await ws.send_json({"media_status": {"playback_status": status}})
+            await asyncio.sleep(interval)
+        return sent
+
+    @property
+    def push_connected(self):
+        return len(self._sockets)
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        route = request.match_info.route.resource
+        template = route.canonical if route is not None else request.path
+        self.requests[template.replace("{liveid}", "<liveid>")] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise web.HTTPInternalServerError(text="injected failure")
+        response = await handler(request)
+
+        if self.etag and response.status == 200:
+            tag = '"{}"'.format(hashlib.sha1(response.body).hexdigest())
+            if request.headers.get("If-None-Match") == tag:
+                return web.Response(status=304, headers={"ETag": tag})
+            response.headers["ETag"] = tag
+        return response
+
+    def _known(self, request):
+        if request.match_info["liveid"] not in self.consoles:
+            raise web.HTTPNotFound()
+
+    @staticmethod
+    def _ok(**data):
+        return web.json_response({"success": True, **data})
+
+    async def _success(self, request):
+        return self._ok()
+
+    async def _versions(self, request):
+        return web.json_response({"versions": {"xbox-smartglass-core": "1.3.0"}})
+
+    async def _auth(self, request):
+        return web.json_response({"authenticated": True})
+
+    async def _pins(self, request):
+        items = [
+            {
+                "Item": {
+                    "ContentType": "DApp",
+                    "Title": f"Pinned App {i}",
+                    "ItemId": f"9WZDNCRF{i:04d}",
+                    "ImageUrl": f"https://store-images.s-microsoft.com/{i}.png",
+                    "Description": "x" * 200,
+                }
+            }
+            for i in range(40)
+        ]
+        return web.json_response({"ListItems": items})
+
+    def _status(self, liveid):
+        return {
+            "liveid": liveid,
+            "name": f"Xbox {liveid[-4:]}",
+            "device_status": "Available",
+            "connection_state": "Connected",
+        }
+
+    async def _devices(self, request):
+        return self._ok(devices={i: self._status(i) for i in self.consoles})
+
+    async def _device(self, request):
+        self._known(request)
+        return self._ok(device=self._status(request.match_info["liveid"]))
+
+    async def _console_status(self, request):
+        self._known(request)
+        return self._ok(
+            console_status={
+                "live_tv_provider": 0,
+                "locale": "en-US",
+                "kernel_version": "10.0.19041.4346",
+                "major_version": 10,
+                "minor_version": 0,
+                "build_number": 19041,
+                "active_titles": [
+                    {
+                        "title_id": 714681658,
+                        "aum": "Microsoft.Xbox.Dashboard_8wekyb3d8bbwe!Xbox.Dashboard.Application",
+                        "name": "Home",
+                        "image": None,
+                        "type": "Application",
+                        "has_focus": False,
+                        "product_id": "00000000-0000-0000-0000-000000000000",
+                        "sandbox_id": "RETAIL",
+                        "disp_mode": 1,
+                    },
+                    {
+                        "title_id": 327370029,
+                        "aum": "4DF9E0F8.Netflix_mcm4njqhnhss8!App",
+                        "name": "Netflix",
+                        "image": "https://store-images.s-microsoft.com/netflix.png",
+                        "type": "Application",
+                        "has_focus": True,
+                        "product_id": "f8d0a5b4-6b14-4a3c-a0e5-a3e5f6f5c0a1",
+                        "sandbox_id": "RETAIL",
+                        "disp_mode": 0,
+                    },
+                ],
+            }
+        )
+
+    async def _media_status(self, request):
+        self._known(request)
+        return self._ok(
+            media_status={
+                "title_id": 327370029,
+                "aum_id": "4DF9E0F8.Netflix_mcm4njqhnhss8!App",
+                "playback_status": "Playing",
+                "media_type": "Video",
+                "position": 12340000000,
+                "media_start": 0,
+                "media_end": 30000000000,
+                "min_seek": 0,
+                "max_seek": 30000000000,
+                "rate": 1.0,
+                "sound_level": "Full",
+                "enabled_commands": ["Play", "Pause", "PlayPauseToggle", "Stop"],
+                "asset_id": "80057281",
+                "metadata": {
+                    "title": "Some Episode",
+                    "subtitle": "S01E01",
+                    "description": "x" * 300,
+                    "seriesTitle": "Some Series",
+                    "seasonNumber": "1",
+                    "episodeNumber": "1",
+                },
+            }
+        )
+
+    async def _ir(self, request):
+        self._known(request)
+        prefix = f"/device/{request.match_info['liveid']}/ir"
+
+        def buttons(device, names):
+            return {
+                "buttons": {
+                    name: {"url": f"{prefix}/{device}/{name}"} for name in names
+                }
+            }
+
+        return self._ok(
+            tv=buttons("tv", ["btn.vol_up", "btn.vol_down", "btn.vol_mute"]),
+            stb=buttons("stb", ["btn.ch_up", "btn.ch_down"]),
+        )
+
+    async def _ws(self, request):
+        self._known(request)
+        liveid = request.match_info["liveid"]
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets[liveid] = ws
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            if self._sockets.get(liveid) is ws:
+                del self._sockets[liveid]
+        return ws
+
+    async def _close_sockets(self, app):
+        for ws in list(self._sockets.values()):
+            await ws.close()
+
+    async def _media(self, request):
+        self._known(request)
+        return self._ok(
+            commands=["play", "pause", "play_pause", "stop", "next_track", "prev_track"]
+        )
+
+
+def _serve(conn, kwargs):
+    async def main():
+        server = FakeSmartGlassServer(**kwargs)
+        conn.send(await server.start())
+
+        loop = asyncio.get_running_loop()
+        stopped = loop.create_future()
+
+        def on_command():
+            command = conn.recv()
+            if isinstance(command, tuple) and command[0] == "push":
+                task = loop.create_task(server.push(*command[1:]))
+                task.add_done_callback(lambda task: conn.send(task.result()))
+            elif command == "push_connected":
+                conn.send(server.push_connected)
+            elif command == "requests":
+                conn.send(dict(server.requests))
+            elif command == "reset":
+                server.requests.clear()
+                conn.send(None)
+            elif command == "stop":
+                stopped.set_result(None)
+
+        loop.add_reader(conn.fileno(), on_command)
+        await stopped
+        loop.remove_reader(conn.fileno())
+        await server.stop()
+        conn.send(None)
+
+    asyncio.run(main())
+
+
+class FakeServerProcess:
+    """FakeSmartGlassServer in a child process, same arguments"""
+
+    def __init__(self, consoles=1, **kwargs):
+        self.consoles = [liveid(i) for i in range(consoles)]
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child, {"consoles": consoles, **kwargs}), daemon=True
+        )
+        self.base_url = None
+
+    def _call(self, command):
+        self._conn.send(command)
+        return self._conn.recv()
+
+    async def start(self):
+        self._process.start()
+        self.base_url = await asyncio.get_running_loop().run_in_executor(
+            None, self._conn.recv
+        )
+        return self.base_url
+
+    @property
+    def requests(self):
+        return Counter(self._call("requests"))
+
+    def reset_requests(self):
+        self._call("reset")
+
+    @property
+    def push_connected(self):
+        return self._call("push_connected")
+
+    async def push(self, count, interval=0.0):
+        self._conn.send(("push", count, interval))
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._conn.recv
+        )
+
+    async def stop(self):
+        self._call("stop")
+        self._process.join()
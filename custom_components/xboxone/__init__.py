@@ -1 +1,42 @@
 """Xbox one smartglass - media player integration"""
+from homeassistant.const import CONF_DEVICE
+
+from .const import (
+    CONF_METRICS,
+    DATA_HASS_CONFIG,
+    DOMAIN,
+    STORAGE_KEY_APPS,
+    STORAGE_VERSION,
+)
+
+
+def _platforms(entry):
+    if {**entry.data, **entry.options}.get(CONF_METRICS):
+        return ["media_player", "sensor"]
+    return ["media_player"]
+
+
+async def async_setup(hass, config):
+    """Keep the configuration, the YAML platform loads its sensors with it"""
+    hass.data.setdefault(DOMAIN, {})[DATA_HASS_CONFIG] = config
+    return True
+
+
+async def async_setup_entry(hass, entry):
+    """Set up the console of a config entry, without waiting on the REST server"""
+    await hass.config_entries.async_forward_entry_setups(entry, _platforms(entry))
+    return True
+
+
+async def async_unload_entry(hass, entry):
+    return await hass.config_entries.async_unload_platforms(entry, _platforms(entry))
+
+
+async def async_remove_entry(hass, entry):
+    """Remove the pinned app catalog saved for the console"""
+    from homeassistant.helpers.storage import Store
+
+    store = Store(
+        hass, STORAGE_VERSION, STORAGE_KEY_APPS.format(liveid=entry.data[CONF_DEVICE])
+    )
+    await store.async_remove()
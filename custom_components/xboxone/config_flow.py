@@ -0,0 +1,61 @@
+"""Config flow for Xbox One"""
+from homeassistant import config_entries
+from homeassistant.const import (
+    CONF_AUTHENTICATION,
+    CONF_DEVICE,
+    CONF_HOST,
+    CONF_IP_ADDRESS,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_SSL,
+)
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .const import (
+    CONF_METRICS,
+    CONF_PUSH,
+    DEFAULT_AUTHENTICATION,
+    DEFAULT_HOST,
+    DEFAULT_METRICS,
+    DEFAULT_NAME,
+    DEFAULT_PORT,
+    DEFAULT_PUSH,
+    DEFAULT_SSL,
+    DOMAIN,
+)
+
+DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_DEVICE): str,
+        vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
+        vol.Optional(CONF_IP_ADDRESS, default=""): str,
+        vol.Optional(CONF_HOST, default=DEFAULT_HOST): str,
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+        vol.Optional(CONF_SSL, default=DEFAULT_SSL): bool,
+        vol.Optional(CONF_AUTHENTICATION, default=DEFAULT_AUTHENTICATION): bool,
+        vol.Optional(CONF_PUSH, default=DEFAULT_PUSH): bool,
+        vol.Optional(CONF_METRICS, default=DEFAULT_METRICS): bool,
+    }
+)
+
+
+class XboxOneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """
+    Add a console served by the REST server.
+
+    The server is not contacted here, the entity comes up unavailable and
+    recovers by itself while the server is down.
+    """
+
+    VERSION = 1
+
+    async def async_step_user(self, user_input=None):
+        if user_input is not None:
+            await self.async_set_unique_id(user_input[CONF_DEVICE])
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title=user_input[CONF_NAME], data=user_input
+            )
+
+        return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA)
@@ -0,0 +1,101 @@
+"""Constants and configuration schema of the Xbox One integration"""
+from homeassistant.const import (
+    CONF_AUTHENTICATION,
+    CONF_DEVICE,
+    CONF_HOST,
+    CONF_IP_ADDRESS,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_SSL,
+)
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+DOMAIN = "xboxone"
+
+DATA_COORDINATORS = "coordinators"
+# Home Assistant configuration, needed to load platforms by discovery
+DATA_HASS_CONFIG = "hass_config"
+DATA_THUMBNAILS = "thumbnails"
+
+# Pinned app catalog persisted per console, so source_list survives restarts
+STORAGE_VERSION = 1
+STORAGE_KEY_APPS = DOMAIN + ".{liveid}.apps"
+
+CONF_CACHE_TTL = "cache_ttl"
+CONF_METRICS = "metrics"
+CONF_SERVERS = "servers"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_PUSH = "push"
+
+DEFAULT_SSL = False
+DEFAULT_HOST = "localhost"
+DEFAULT_NAME = "Xbox One SmartGlass"
+DEFAULT_PORT = 5557
+DEFAULT_AUTHENTICATION = True
+DEFAULT_PUSH = False
+DEFAULT_METRICS = False
+
+# How long (in seconds) a successful response is reused before it is fetched
+# again. 0 means the endpoint is fetched on every poll.
+CACHE_VERSIONS = "versions"
+CACHE_AUTH = "auth"
+CACHE_DEVICELIST = "devicelist"
+CACHE_DEVICE_INFO = "device_info"
+CACHE_CONSOLE_STATUS = "console_status"
+CACHE_MEDIA_STATUS = "media_status"
+CACHE_IR = "ir"
+CACHE_PINS = "pins"
+
+DEFAULT_CACHE_TTL = {
+    CACHE_VERSIONS: 3600,
+    CACHE_AUTH: 300,
+    CACHE_DEVICELIST: 60,
+    CACHE_DEVICE_INFO: 0,
+    CACHE_CONSOLE_STATUS: 0,
+    CACHE_MEDIA_STATUS: 0,
+    CACHE_IR: 600,
+    CACHE_PINS: 3600,
+}
+
+CACHE_TTL_SCHEMA = vol.Schema(
+    {vol.Optional(key): cv.positive_int for key in DEFAULT_CACHE_TTL}
+)
+
+# Seconds between polls, picked per console from its current state
+POLL_ACTIVE = "active"
+POLL_IDLE = "idle"
+POLL_OFF = "off"
+POLL_MAX_BACKOFF = "max_backoff"
+
+DEFAULT_POLL_INTERVAL = {
+    POLL_ACTIVE: 5,
+    POLL_IDLE: 15,
+    POLL_OFF: 60,
+    POLL_MAX_BACKOFF: 300,
+}
+
+POLL_INTERVAL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(key): vol.All(vol.Coerce(int), vol.Range(min=1))
+        for key in DEFAULT_POLL_INTERVAL
+    }
+)
+
+XBOXONE_SCHEMA = {
+    vol.Required(CONF_DEVICE): cv.string,
+    vol.Optional(CONF_IP_ADDRESS, default=""): cv.string,
+    vol.Optional(CONF_HOST, default=DEFAULT_HOST): cv.string,
+    vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+    vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+    vol.Optional(CONF_SSL, default=DEFAULT_SSL): cv.boolean,
+    vol.Optional(CONF_AUTHENTICATION, default=DEFAULT_AUTHENTICATION): cv.boolean,
+    vol.Optional(CONF_CACHE_TTL, default={}): CACHE_TTL_SCHEMA,
+    vol.Optional(CONF_PUSH, default=DEFAULT_PUSH): cv.boolean,
+    vol.Optional(CONF_POLL_INTERVAL, default={}): POLL_INTERVAL_SCHEMA,
+    vol.Optional(CONF_METRICS, default=DEFAULT_METRICS): cv.boolean,
+    vol.Optional(CONF_SERVERS, default=[]): vol.All(cv.ensure_list, [cv.url]),
+}
+
+# Config entries store the options of the setup form, the rest is defaulted
+ENTRY_SCHEMA = vol.Schema(XBOXONE_SCHEMA, extra=vol.REMOVE_EXTRA)
@@ -0,0 +1,910 @@
+"""
+Requests to the SmartGlass REST server, shared by every console behind it.
+
+Scheduling, circuit breaking, authentication and metrics of one server, and
+the parsing helpers of its responses.
+"""
+import asyncio
+from collections import Counter
+from contextvars import ContextVar
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import sys
+from urllib.parse import urljoin
+
+import aiohttp
+import homeassistant.util.dt as dt_util
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SSL
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CACHE_AUTH,
+    CACHE_DEVICELIST,
+    CACHE_VERSIONS,
+    CONF_SERVERS,
+    DATA_COORDINATORS,
+    DOMAIN,
+)
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_REQUIRED_SERVER_VERSION = "1.1.2"
+
+# Requests in flight per REST server, the add-on is a single process. One of
+# the slots is kept for commands.
+SERVER_MAX_CONCURRENCY = 4
+
+# Request priority classes, lower goes first
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_NAMES = {
+    PRIORITY_COMMAND: "command",
+    PRIORITY_POLL: "poll",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# Time budget of a single request, in seconds
+REQUEST_TIMEOUT = 5
+
+# Consecutive failed requests before a REST server is considered dead, and
+# seconds before a single probe request is let through again
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Standby REST servers are probed at most this often, in seconds, and the
+# latency of a server is smoothed over its requests
+SERVER_PROBE_INTERVAL = 30
+SERVER_LATENCY_SMOOTHING = 0.2
+
+# Upper bounds (in seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, float("inf"))
+
+# Refresh auth this long before the token expires
+AUTH_EXPIRY_MARGIN = 60
+# A failed auth check is not repeated for this long
+AUTH_RETRY_INTERVAL = 30
+
+
+def get_base_url(config):
+    proto = "https" if config[CONF_SSL] else "http"
+    return f"{proto}://{config[CONF_HOST]}:{config[CONF_PORT]}"
+
+
+def get_base_urls(config):
+    """Urls of every REST server of a console, primary first"""
+    return [get_base_url(config), *config[CONF_SERVERS]]
+
+
+_MISSING = object()
+
+
+class _NotModified(dict):
+    """Response of a conditional request whose payload did not change"""
+
+
+NOT_MODIFIED = _NotModified(success=True)
+
+
+def extract_fields(data, fields):
+    """Copy of data with only the given fields, lists apply them per item"""
+    if isinstance(data, list):
+        return [extract_fields(item, fields) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    wildcard = fields.get("*", _MISSING)
+    result = {}
+    for key, value in data.items():
+        kept = fields.get(key, wildcard)
+        if kept is _MISSING:
+            continue
+        result[key] = value if kept is None else extract_fields(value, kept)
+    return result
+
+
+def deep_sizeof(obj):
+    """Approximate memory held by a tree of dicts, lists and scalars"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item) for item in obj)
+    return size
+
+
+# Priority of the requests made by the current task, see RequestScheduler
+request_priority = ContextVar("xboxone_request_priority", default=PRIORITY_POLL)
+
+
+class RequestScheduler:
+    """
+    Admits requests to one REST server by priority, up to a concurrency cap.
+
+    Waiting requests are started commands first, then polls, then background
+    work, in arrival order within a class. The last free slot is only given
+    to commands, so a slow server delays polls but never queues a command
+    behind them.
+    """
+
+    def __init__(self, hass, limit=SERVER_MAX_CONCURRENCY):
+        self._hass = hass
+        self._limit = limit
+        self._active = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self.stats = {
+            priority: {"requests": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for priority in PRIORITY_NAMES
+        }
+
+    def _has_slot(self, priority):
+        if priority == PRIORITY_COMMAND:
+            return self._active < self._limit
+        return self._active < self._limit - 1
+
+    def _record_wait(self, priority, wait):
+        stats = self.stats[priority]
+        stats["requests"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+
+    async def acquire(self, priority):
+        waiters = self._waiters
+        if self._has_slot(priority) and (not waiters or waiters[0][0] > priority):
+            self._active += 1
+            self._record_wait(priority, 0.0)
+            return
+
+        loop = self._hass.loop
+        future = loop.create_future()
+        queued_at = loop.time()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted as the waiter got cancelled
+                self.release()
+            raise
+        self._record_wait(priority, loop.time() - queued_at)
+
+    def release(self):
+        self._active -= 1
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._has_slot(priority):
+                return
+            heapq.heappop(self._waiters)
+            self._active += 1
+            future.set_result(None)
+
+    def as_dict(self):
+        depth = Counter(
+            PRIORITY_NAMES[priority]
+            for priority, _, future in self._waiters
+            if not future.cancelled()
+        )
+        return {
+            "active": self._active,
+            "limit": self._limit,
+            "queued": dict(depth),
+            "wait": {
+                PRIORITY_NAMES[priority]: {
+                    "requests": stats["requests"],
+                    "mean": (
+                        stats["wait_total"] / stats["requests"]
+                        if stats["requests"]
+                        else None
+                    ),
+                    "max": stats["wait_max"],
+                }
+                for priority, stats in self.stats.items()
+            },
+        }
+
+
+class CircuitBreaker:
+    """
+    Stops talking to a REST server that keeps failing.
+
+    After `threshold` consecutive failures the breaker opens and requests are
+    refused without network I/O. Once `reset_timeout` seconds passed, a single
+    probe request is let through (half-open); its outcome closes the breaker
+    again or reopens it.
+    """
+
+    def __init__(
+        self,
+        hass,
+        threshold=BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=BREAKER_RESET_TIMEOUT,
+    ):
+        self._hass = hass
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def failures(self):
+        """Consecutive failed requests"""
+        return self._failures
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return BREAKER_CLOSED
+        if self._hass.loop.time() - self._opened_at < self._reset_timeout:
+            return BREAKER_OPEN
+        return BREAKER_HALF_OPEN
+
+    def allow_request(self):
+        state = self.state
+        if state == BREAKER_CLOSED:
+            return True
+        if state == BREAKER_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self._probe_in_flight or (
+            self._opened_at is None and self._failures >= self._threshold
+        ):
+            if self._opened_at is None:
+                self.trips += 1
+            self._opened_at = self._hass.loop.time()
+        self._probe_in_flight = False
+
+    def release(self):
+        """The request was abandoned without an outcome"""
+        self._probe_in_flight = False
+
+    def as_dict(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class AuthManager:
+    """
+    Xbox Live authentication state of one REST server.
+
+    Remembers when the tokens were last verified and when they expire, and
+    answers from memory in between. A refresh is scheduled in the background
+    ahead of the expiry, so polls don't find the tokens expired. Every
+    console behind the server shares this state.
+    """
+
+    def __init__(self, hass, get):
+        self._hass = hass
+        self._get = get
+        self._task = None
+        self._cancel_refresh = None
+        self.authenticated = None
+        self.verified_at = None
+        self.valid_until = None
+        self.checks = 0
+        self.refreshes = 0
+        self.background_refreshes = 0
+
+    def is_known(self, max_age):
+        """Whether the last verification still answers a check"""
+        if self.verified_at is None:
+            return False
+        now = self._hass.loop.time()
+        if not self.authenticated:
+            return now < self.verified_at + min(max_age, AUTH_RETRY_INTERVAL)
+        if self.valid_until is not None and now >= self.valid_until:
+            return False
+        return now < self.verified_at + max_age
+
+    async def async_check(self, max_age):
+        if self.is_known(max_age):
+            return self.authenticated
+
+        if self._task is None:
+            self._task = self._hass.loop.create_task(self._verify())
+
+            def _done(_):
+                self._task = None
+
+            self._task.add_done_callback(_done)
+
+        return await asyncio.shield(self._task)
+
+    def invalidate(self):
+        self.verified_at = None
+        self._async_cancel_refresh()
+
+    @callback
+    def _async_cancel_refresh(self):
+        if self._cancel_refresh is not None:
+            self._cancel_refresh()
+            self._cancel_refresh = None
+
+    @staticmethod
+    def _token_lifetime(response):
+        """Seconds until the first unexpired reported token expires, if known"""
+        lifetimes = []
+        tokens = response.get("tokens")
+        if isinstance(tokens, dict):
+            for token in tokens.values():
+                if not isinstance(token, dict) or not token.get("date_valid"):
+                    continue
+                valid_until = dt_util.parse_datetime(str(token["date_valid"]))
+                if valid_until is None:
+                    continue
+                if valid_until.tzinfo is None:
+                    valid_until = valid_until.replace(tzinfo=dt_util.UTC)
+                lifetime = (valid_until - dt_util.utcnow()).total_seconds()
+                # Expired tokens are left over and not renewed by a refresh
+                if lifetime > 0:
+                    lifetimes.append(lifetime)
+        return min(lifetimes) if lifetimes else None
+
+    def _record(self, authenticated, response=None):
+        self.authenticated = authenticated
+        self.verified_at = self._hass.loop.time()
+        self.valid_until = None
+        self._async_cancel_refresh()
+
+        lifetime = self._token_lifetime(response) if response else None
+        if lifetime is None:
+            return
+
+        # Don't loop on tokens the server keeps reporting as short-lived
+        refresh_in = max(lifetime - AUTH_EXPIRY_MARGIN, AUTH_RETRY_INTERVAL)
+        self.valid_until = self.verified_at + refresh_in
+        self._cancel_refresh = async_call_later(
+            self._hass, refresh_in, self._async_background_refresh
+        )
+
+    async def _verify(self):
+        self.checks += 1
+        response = await self._get("/auth")
+        if response.get("authenticated"):
+            self._record(True, response)
+            return True
+
+        return await self._refresh()
+
+    async def _refresh(self):
+        self.refreshes += 1
+        response = await self._get("/auth/refresh")
+        if response.get("success"):
+            self._record(True, response)
+            return True
+
+        _LOGGER.error("Refreshing authentication tokens failed!")
+        self._record(False)
+        return False
+
+    async def _background_refresh(self):
+        request_priority.set(PRIORITY_BACKGROUND)
+        return await self._refresh()
+
+    async def _async_background_refresh(self, now=None):
+        self._cancel_refresh = None
+        if self._task is not None:
+            return
+        self.background_refreshes += 1
+        self._task = self._hass.loop.create_task(self._background_refresh())
+
+        def _done(_):
+            self._task = None
+
+        self._task.add_done_callback(_done)
+
+    def as_dict(self):
+        now = self._hass.loop.time()
+        verified_at, valid_until = self.verified_at, self.valid_until
+        return {
+            "authenticated": self.authenticated,
+            "verified_ago": None if verified_at is None else now - verified_at,
+            "valid_for": None if valid_until is None else valid_until - now,
+            "checks": self.checks,
+            "refreshes": self.refreshes,
+            "background_refreshes": self.background_refreshes,
+        }
+
+
+class RequestMetrics:
+    """
+    Request and refresh instrumentation of one REST server.
+
+    Requests are grouped by endpoint template, e.g.
+    /device/<liveid>/media_status, and totalled per console they were made
+    for. Only allocated when metrics are enabled.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        self.consoles = {}
+        self.refreshes = {}
+
+    def record_request(
+        self,
+        template,
+        duration,
+        status=None,
+        error=None,
+        size=0,
+        parse_time=0.0,
+        unchanged=False,
+        liveid=None,
+    ):
+        endpoint = self.endpoints.get(template)
+        if endpoint is None:
+            endpoint = self.endpoints[template] = {
+                "requests": 0,
+                "latency_total": 0.0,
+                "latency_max": 0.0,
+                "histogram": [0] * len(LATENCY_BUCKETS),
+                "status": Counter(),
+                "errors": Counter(),
+                "bytes": 0,
+                "parse_time": 0.0,
+                "unchanged": 0,
+            }
+
+        endpoint["requests"] += 1
+        endpoint["latency_total"] += duration
+        endpoint["latency_max"] = max(endpoint["latency_max"], duration)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                endpoint["histogram"][index] += 1
+                break
+        if status is not None:
+            endpoint["status"][status] += 1
+        if error is not None:
+            endpoint["errors"][error] += 1
+        endpoint["bytes"] += size
+        endpoint["parse_time"] += parse_time
+        endpoint["unchanged"] += unchanged
+
+        if liveid is None:
+            return
+        console = self.consoles.get(liveid)
+        if console is None:
+            console = self.consoles[liveid] = {
+                "requests": 0,
+                "errors": 0,
+                "latency_total": 0.0,
+            }
+        console["requests"] += 1
+        console["errors"] += error is not None
+        console["latency_total"] += duration
+
+    def record_refresh(self, liveid, duration):
+        refresh = self.refreshes.get(liveid)
+        if refresh is None:
+            refresh = self.refreshes[liveid] = {
+                "count": 0,
+                "last": 0.0,
+                "total": 0.0,
+                "max": 0.0,
+            }
+        refresh["count"] += 1
+        refresh["last"] = duration
+        refresh["total"] += duration
+        refresh["max"] = max(refresh["max"], duration)
+
+    def as_dict(self):
+        return {
+            "endpoints": {
+                template: {
+                    "requests": endpoint["requests"],
+                    "mean_latency": endpoint["latency_total"] / endpoint["requests"],
+                    "max_latency": endpoint["latency_max"],
+                    "histogram": dict(
+                        zip((str(b) for b in LATENCY_BUCKETS), endpoint["histogram"])
+                    ),
+                    "status": dict(endpoint["status"]),
+                    "errors": dict(endpoint["errors"]),
+                    "bytes": endpoint["bytes"],
+                    "mean_parse_time": endpoint["parse_time"] / endpoint["requests"],
+                    "unchanged": endpoint["unchanged"],
+                }
+                for template, endpoint in self.endpoints.items()
+            },
+            "consoles": {
+                liveid: {
+                    "requests": console["requests"],
+                    "errors": console["errors"],
+                    "mean_latency": console["latency_total"] / console["requests"],
+                }
+                for liveid, console in self.consoles.items()
+            },
+            "refreshes": {
+                liveid: {
+                    "count": refresh["count"],
+                    "last": refresh["last"],
+                    "mean": refresh["total"] / refresh["count"],
+                    "max": refresh["max"],
+                }
+                for liveid, refresh in self.refreshes.items()
+            },
+        }
+
+
+@callback
+def async_get_coordinator(hass, base_url):
+    """Return the coordinator shared by every console behind a REST server"""
+    coordinators = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})
+    coordinator = coordinators.get(base_url)
+    if coordinator is None:
+        coordinator = coordinators[base_url] = XboxOneCoordinator(hass, base_url)
+    return coordinator
+
+
+async def async_release_coordinators(hass):
+    """Close the coordinators no console is registered with anymore"""
+    coordinators = hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {})
+    for base_url, coordinator in list(coordinators.items()):
+        if not coordinator.consoles:
+            del coordinators[base_url]
+            await coordinator.async_close()
+
+
+class XboxOneCoordinator:
+    """
+    Shared state of one SmartGlass REST server.
+
+    Server version, authentication and device enumeration are the same for
+    every console behind a server. They are requested here once and the
+    results are handed to every XboxOne using the server, concurrent callers
+    share a single in-flight request.
+    """
+
+    def __init__(self, hass, base_url):
+        self.is_server_up = False
+        self.is_server_correct_version = True
+
+        self.base_url = base_url
+        self._hass = hass
+        self._fetched_at = {}
+        self._results = {}
+        self._in_flight = {}
+        # Latest enumeration per discovery address, None for broadcast
+        self._devices = {}
+        self.breaker = CircuitBreaker(hass)
+        self.scheduler = RequestScheduler(hass)
+        self.auth = AuthManager(hass, self.get)
+        self.metrics = None
+        self.consoles = {}
+        self.latency = None
+        self._probed_at = None
+
+    def enable_metrics(self):
+        if self.metrics is None:
+            self.metrics = RequestMetrics()
+
+    @callback
+    def async_register(self, xboxone):
+        """Track a console for diagnostics, returns a callback removing it"""
+        self.consoles[xboxone.liveid] = xboxone
+
+        @callback
+        def unregister():
+            self.consoles.pop(xboxone.liveid, None)
+
+        return unregister
+
+    def as_dict(self):
+        """Diagnostics of the server and every console registered with it"""
+        return {
+            "base_url": self.base_url,
+            "server_up": self.is_server_up,
+            "server_correct_version": self.is_server_correct_version,
+            "breaker": self.breaker.as_dict(),
+            "scheduler": self.scheduler.as_dict(),
+            "auth": self.auth.as_dict(),
+            "latency": self.latency,
+            "metrics": self.metrics.as_dict() if self.metrics else None,
+            "consoles": {
+                liveid: xboxone.as_dict() for liveid, xboxone in self.consoles.items()
+            },
+        }
+
+    @property
+    def session(self):
+        """Home Assistant's shared keep-alive session, never closed here"""
+        return async_get_clientsession(self._hass)
+
+    async def async_close(self):
+        """Stop the background auth refresh"""
+        self.auth.invalidate()
+
+    async def get(
+        self, endpoint, params=None, template=None, validator=None, liveid=None
+    ):
+        """
+        GET endpoint, {} on failure.
+
+        The request waits for the scheduler, at the priority of the calling
+        task (request_priority).
+
+        With a validator (a dict owned by the caller), the request is
+        conditional: the ETag/Last-Modified of the previous response are sent
+        along and a body hash is kept, of successful answers only.
+        NOT_MODIFIED is returned, without parsing, on a 304 or when the body
+        hash did not change.
+
+        liveid is the console the request is made for, in the metrics.
+        """
+        scheduler = self.scheduler
+        await scheduler.acquire(request_priority.get())
+        try:
+            return await self._get(endpoint, params, template, validator, liveid)
+        finally:
+            scheduler.release()
+
+    async def _get(self, endpoint, params, template, validator, liveid):
+        full_url = urljoin(self.base_url, endpoint)
+
+        if params:
+            # aiohttp only accepts str/int/float query values
+            params = {
+                k: str(v) if isinstance(v, bool) else v for k, v in params.items()
+            }
+
+        if not self.breaker.allow_request():
+            _LOGGER.debug("Circuit open for %s, skipping %s", self.base_url, endpoint)
+            return {}
+
+        headers = None
+        if validator is not None:
+            if validator.get("base_url") != self.base_url:
+                # Validators of another server mean nothing here
+                validator.clear()
+            headers = {}
+            if validator.get("etag"):
+                headers[aiohttp.hdrs.IF_NONE_MATCH] = validator["etag"]
+            if validator.get("last_modified"):
+                headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = validator["last_modified"]
+
+        metrics = self.metrics
+        started = self._hass.loop.time()
+        reachable = None
+        status = error = None
+        body = b""
+        parse_time = 0.0
+        unchanged = False
+        validated = False
+        try:
+            async with self.session.get(
+                full_url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as response:
+                reachable = True
+                status = response.status
+                if status == 304 and validator:
+                    unchanged = validated = True
+                    return NOT_MODIFIED
+
+                body = await response.read()
+                if response.status != 200:
+                    _LOGGER.warning(
+                        "Invalid status_code %s from url %s", response.status, full_url
+                    )
+                    _LOGGER.warning(body.decode(errors="replace"))
+                    return {}
+
+                if validator is not None:
+                    digest = hashlib.sha1(body).digest()
+                    if digest == validator.get("digest"):
+                        unchanged = validated = True
+                        return NOT_MODIFIED
+
+                if metrics is not None:
+                    parsed = self._hass.loop.time()
+                    json_response = json_loads(body)
+                    parse_time = self._hass.loop.time() - parsed
+                else:
+                    json_response = json_loads(body)
+
+                # Only a successful payload may stand in for later answers, a
+                # repeated failure must not come back as NOT_MODIFIED
+                if (
+                    validator is not None
+                    and isinstance(json_response, dict)
+                    and json_response.get("success")
+                ):
+                    validated = True
+                    validator.update(
+                        base_url=self.base_url,
+                        etag=response.headers.get(aiohttp.hdrs.ETAG),
+                        last_modified=response.headers.get(aiohttp.hdrs.LAST_MODIFIED),
+                        digest=digest,
+                    )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.warning("Request failed for url %s", full_url)
+            reachable = False
+            error = type(err).__name__
+            self.invalidate(CACHE_VERSIONS)
+            return {}
+        except ValueError:
+            _LOGGER.warning("Unable to parse JSON from response")
+            error = "invalid_json"
+            return {}
+        finally:
+            if validator is not None and not validated:
+                validator.clear()
+            elapsed = self._hass.loop.time() - started
+            if reachable is None:
+                self.breaker.release()
+            elif reachable:
+                self.breaker.record_success()
+                self._record_latency(elapsed)
+            else:
+                self.breaker.record_failure()
+            if metrics is not None:
+                metrics.record_request(
+                    template or endpoint,
+                    elapsed,
+                    status,
+                    error,
+                    len(body),
+                    parse_time,
+                    unchanged,
+                    liveid,
+                )
+
+        return json_response
+
+    def _record_latency(self, elapsed):
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += SERVER_LATENCY_SMOOTHING * (elapsed - self.latency)
+
+    @callback
+    def async_probe(self):
+        """Measure latency and health in the background, rate limited"""
+        now = self._hass.loop.time()
+        probed_at = self._probed_at
+        if probed_at is not None and now < probed_at + SERVER_PROBE_INTERVAL:
+            return
+        self._probed_at = now
+        self._hass.loop.create_task(self._probe())
+
+    async def _probe(self):
+        request_priority.set(PRIORITY_BACKGROUND)
+        await self.async_check_server(0)
+
+    @property
+    def server_available(self):
+        return self.breaker.state != BREAKER_OPEN
+
+    def _is_fresh(self, key, max_age):
+        fetched_at = self._fetched_at.get(key)
+        return (
+            fetched_at is not None
+            and self._hass.loop.time() < fetched_at + max_age
+            and key in self._results
+        )
+
+    def _mark_fetched(self, key):
+        self._fetched_at[key] = self._hass.loop.time()
+
+    def invalidate(self, key=None):
+        """Drop cached shared results, devicelist keys match every address"""
+        if key in (None, CACHE_AUTH):
+            self.auth.invalidate()
+        for cached in list(self._fetched_at):
+            if key is None or key == cached[0]:
+                del self._fetched_at[cached]
+
+    async def _shared(self, key, max_age, fetch):
+        """
+        Return the cached result for key while it is fresh.
+
+        Otherwise run fetch, sharing the request with every concurrent caller.
+        fetch marks the result as cacheable by calling _mark_fetched.
+        """
+        if self._is_fresh(key, max_age):
+            return self._results[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = self._hass.loop.create_task(fetch())
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        result = await asyncio.shield(task)
+        self._results[key] = result
+        return result
+
+    async def async_check_server(self, max_age):
+        if not self.is_server_correct_version:
+            return False
+
+        return await self._shared((CACHE_VERSIONS,), max_age, self._check_server)
+
+    async def _check_server(self):
+        response = await self.get("/versions")
+        if not response:
+            self.is_server_up = False
+            return False
+
+        # Imported on first use, packaging is only needed for this check
+        from packaging import version
+
+        lib_version = response["versions"]["xbox-smartglass-core"]
+        if version.parse(lib_version) < version.parse(MIN_REQUIRED_SERVER_VERSION):
+            self.is_server_correct_version = False
+            _LOGGER.error(
+                "Invalid xbox-smartglass-core version: %s. Min Required: %s",
+                lib_version,
+                MIN_REQUIRED_SERVER_VERSION,
+            )
+
+        self.is_server_up = True
+        self._mark_fetched((CACHE_VERSIONS,))
+        return True
+
+    async def async_check_authentication(self, max_age):
+        return await self.auth.async_check(max_age)
+
+    async def async_refresh_devicelist(self, addr, max_age):
+        """Enumerate consoles, optionally by unicast discovery of addr"""
+
+        async def _refresh_devicelist():
+            params = None
+            if addr:
+                params = {"addr": addr}
+            response = await self.get("/device", params=params)
+            if not response.get("success"):
+                return False
+
+            devices = response.get("devices") or {}
+            if isinstance(devices, list):
+                devices = {d.get("liveid"): d for d in devices if isinstance(d, dict)}
+            # Replaced as a whole, a console missing from the answer is gone
+            self._devices[addr] = devices
+            self._mark_fetched((CACHE_DEVICELIST, addr))
+            return True
+
+        return await self._shared(
+            (CACHE_DEVICELIST, addr), max_age, _refresh_devicelist
+        )
+
+    def enumerated_device(self, liveid, addr, max_age):
+        """Device entry from a still fresh enumeration, None if unknown"""
+        if not self._is_fresh((CACHE_DEVICELIST, addr), max_age):
+            return None
+        return self._devices.get(addr, {}).get(liveid)
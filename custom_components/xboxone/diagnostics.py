@@ -0,0 +1,40 @@
+"""Diagnostics support for Xbox One"""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_DEVICE, CONF_HOST, CONF_IP_ADDRESS
+
+from .const import CONF_SERVERS, DATA_COORDINATORS, DOMAIN, ENTRY_SCHEMA
+from .coordinator import get_base_urls
+
+TO_REDACT = {
+    CONF_DEVICE,
+    CONF_HOST,
+    CONF_IP_ADDRESS,
+    CONF_SERVERS,
+    "base_url",
+    "server",
+}
+
+
+def _server_diagnostics(coordinator, liveid):
+    """Diagnostics of a REST server, of the entry's console only"""
+    data = coordinator.as_dict()
+    data["console"] = data.pop("consoles").get(liveid)
+    metrics = data["metrics"]
+    if metrics is not None:
+        metrics["console"] = metrics.pop("consoles").get(liveid)
+        metrics["refresh"] = metrics.pop("refreshes").get(liveid)
+    return data
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Request metrics, breaker and console state of the entry's REST servers"""
+    config = ENTRY_SCHEMA({**entry.data, **entry.options})
+    coordinators = hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {})
+    rest_servers = [
+        _server_diagnostics(coordinators[base_url], config[CONF_DEVICE])
+        for base_url in get_base_urls(config)
+        if base_url in coordinators
+    ]
+    return async_redact_data(
+        {"config": config, "rest_servers": rest_servers}, TO_REDACT
+    )
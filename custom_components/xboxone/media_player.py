@@ -8,21 +8,24 @@ CREDITS:
 - This module is based on media_player.firetv component, initially created by @happyleavesaoc
 - Original code: https://github.com/home-assistant/home-assistant/blob/dev/homeassistant/components/media_player/firetv.py
 """
-import functools
+import asyncio
+from collections import Counter, OrderedDict, deque
+import hashlib
+import json
 import logging
+import os
+import random
 from urllib.parse import urljoin
 from functools import partial
 
 
+import aiohttp
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
-import requests
 import voluptuous as vol
 from homeassistant.components.media_player import PLATFORM_SCHEMA, MediaPlayerEntity
 from homeassistant.components.media_player.const import (
-    MEDIA_TYPE_CHANNEL,
     MEDIA_TYPE_MUSIC,
-    MEDIA_TYPE_TVSHOW,
     MEDIA_TYPE_VIDEO,
     SUPPORT_NEXT_TRACK,
     SUPPORT_PAUSE,
@@ -37,11 +40,8 @@ from homeassistant.components.media_player.const import (
 from homeassistant.const import (
     CONF_AUTHENTICATION,
     CONF_DEVICE,
-    CONF_HOST,
     CONF_IP_ADDRESS,
     CONF_NAME,
-    CONF_PORT,
-    CONF_SSL,
     STATE_IDLE,
     STATE_OFF,
     STATE_ON,
@@ -49,7 +49,54 @@ from homeassistant.const import (
     STATE_PLAYING,
     STATE_UNKNOWN,
 )
-from packaging import version
+from homeassistant.core import HassJob, SupportsResponse, callback
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CACHE_AUTH,
+    CACHE_CONSOLE_STATUS,
+    CACHE_DEVICE_INFO,
+    CACHE_DEVICELIST,
+    CACHE_IR,
+    CACHE_MEDIA_STATUS,
+    CACHE_PINS,
+    CACHE_VERSIONS,
+    CONF_CACHE_TTL,
+    CONF_METRICS,
+    CONF_POLL_INTERVAL,
+    CONF_PUSH,
+    CONF_SERVERS,
+    DATA_HASS_CONFIG,
+    DATA_THUMBNAILS,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_POLL_INTERVAL,
+    DOMAIN,
+    ENTRY_SCHEMA,
+    POLL_ACTIVE,
+    POLL_IDLE,
+    POLL_MAX_BACKOFF,
+    POLL_OFF,
+    STORAGE_KEY_APPS,
+    STORAGE_VERSION,
+    XBOXONE_SCHEMA,
+)
+from .coordinator import (
+    NOT_MODIFIED,
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    async_get_coordinator,
+    async_release_coordinators,
+    deep_sizeof,
+    extract_fields,
+    get_base_url,
+    get_base_urls,
+    json_loads,
+    request_priority,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,49 +112,299 @@ SUPPORT_XBOXONE = (
     | SUPPORT_VOLUME_MUTE
 )
 
-MIN_REQUIRED_SERVER_VERSION = "1.1.2"
-
-DEFAULT_SSL = False
-DEFAULT_HOST = "localhost"
-DEFAULT_NAME = "Xbox One SmartGlass"
-DEFAULT_PORT = 5557
-DEFAULT_AUTHENTICATION = True
-
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
-    {
-        vol.Required(CONF_DEVICE): cv.string,
-        vol.Optional(CONF_IP_ADDRESS, default=""): cv.string,
-        vol.Optional(CONF_HOST, default=DEFAULT_HOST): cv.string,
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-        vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
-        vol.Optional(CONF_SSL, default=DEFAULT_SSL): cv.boolean,
-        vol.Optional(CONF_AUTHENTICATION, default=DEFAULT_AUTHENTICATION): cv.boolean,
-    }
+# A reported media position within this many seconds of where playback is
+# expected to be is not treated as a change
+MEDIA_POSITION_TOLERANCE = 3
+
+# Time budget of one whole refresh, in seconds
+REFRESH_DEADLINE = 8
+
+# Requests move to another server when its smoothed latency is below this
+# ratio times the current one, or at once when the current one fails
+SERVER_SWITCH_RATIO = 0.7
+
+# Seconds before the first retry of a failed console connect, doubling (with
+# jitter) after every further failure up to the maximum
+CONNECT_BACKOFF_BASE = 5
+CONNECT_BACKOFF_MAX = 300
+
+CONNECTION_UNAVAILABLE = "unavailable"
+CONNECTION_CONNECTING = "connecting"
+CONNECTION_CONNECTED = "connected"
+CONNECTION_BACKOFF = "backoff"
+
+# After a power on the wake request is resent every POWERON_RESEND_INTERVAL
+# seconds and the device list probed every POWERON_PROBE_INTERVAL seconds
+# until the console is up, for at most POWERON_TIMEOUT seconds
+POWERON_RESEND_INTERVAL = 3
+POWERON_PROBE_INTERVAL = 1
+POWERON_TIMEOUT = 60
+
+SERVICE_SEND_SEQUENCE = "send_sequence"
+ATTR_STEPS = "steps"
+ATTR_IR_DEVICE = "device"
+ATTR_TIMEOUT = "timeout"
+
+STEP_LAUNCH = "launch"
+STEP_MEDIA = "media"
+STEP_IR = "ir"
+STEP_DELAY = "delay"
+STEP_WAIT_FOR_TITLE = "wait_for_title"
+
+# Seconds between console status checks of a wait_for_title step
+WAIT_FOR_TITLE_INTERVAL = 1
+DEFAULT_WAIT_FOR_TITLE_TIMEOUT = 30
+
+STEP_SCHEMA = vol.Any(
+    vol.Schema({vol.Required(STEP_LAUNCH): cv.string}),
+    vol.Schema({vol.Required(STEP_MEDIA): cv.string}),
+    vol.Schema(
+        {
+            vol.Required(STEP_IR): cv.string,
+            vol.Optional(ATTR_IR_DEVICE, default="tv"): cv.string,
+        }
+    ),
+    vol.Schema({vol.Required(STEP_DELAY): cv.positive_time_period}),
+    vol.Schema(
+        {
+            vol.Required(STEP_WAIT_FOR_TITLE): cv.string,
+            vol.Optional(
+                ATTR_TIMEOUT, default=DEFAULT_WAIT_FOR_TITLE_TIMEOUT
+            ): cv.positive_int,
+        }
+    ),
+)
+
+SEND_SEQUENCE_SCHEMA = {
+    vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, [STEP_SCHEMA]),
+}
+
+# Volume/channel steps arriving within this window are sent as one batch
+COMMAND_COALESCE_WINDOW = 0.05
+
+# Fields kept of the REST server responses, everything else is dropped on
+# arrival. A field maps to the fields kept of its value, None keeps the value
+# whole, "*" matches every key. See extract_fields.
+DEVICE_INFO_FIELDS = dict.fromkeys(
+    ("liveid", "name", "device_status", "connection_state")
 )
+CONSOLE_STATUS_FIELDS = {
+    "active_titles": dict.fromkeys(
+        ("name", "aum", "type", "image", "has_focus", "title_id")
+    )
+}
+MEDIA_STATUS_FIELDS = {
+    **dict.fromkeys(
+        ("playback_status", "media_type", "position", "media_end", "title_id", "aum_id")
+    ),
+    "metadata": {"title": None},
+}
+IR_FIELDS = {"*": {"buttons": {"*": {"url": None}}}}
+
+# Per-console event stream of the REST server, used in push mode
+PUSH_ENDPOINT = "/device/<liveid>/ws"
+PUSH_HEARTBEAT = 30
+PUSH_RECONNECT_DELAY = 30
+# Seconds between polls of what the stream doesn't carry: availability, auth,
+# pinned apps and the IR/media command tables
+PUSH_POLL_INTERVAL = 60
+
+# Endpoints shared by every console behind one REST server
+SHARED_CACHE_KEYS = (CACHE_VERSIONS, CACHE_AUTH, CACHE_DEVICELIST)
+
+# Poll at the active interval for this long after a command was sent
+COMMAND_ACTIVE_WINDOW = 30
+
+# Seconds before a changed pinned app catalog is saved
+APPS_SAVE_DELAY = 10
+
+# Box art served through the media player image proxy, cached in memory and on
+# disk; limits are in bytes
+# Outside .storage, which holds JSON stores and is part of every backup
+THUMBNAIL_DIR = os.path.join(".cache", DOMAIN, "thumbnails")
+THUMBNAIL_MEMORY_LIMIT = 4 * 1024 * 1024
+THUMBNAIL_DISK_LIMIT = 50 * 1024 * 1024
+
+DEFAULT_APPS = {"Home": "ms-xbox-dashboard://home?view=home", "TV": "ms-xbox-livetv://"}
+
+PLAYBACK_STATES = {
+    "Closed": STATE_IDLE,
+    "Changing": STATE_IDLE,
+    "Stopped": STATE_IDLE,
+    "Playing": STATE_PLAYING,
+    "Paused": STATE_PAUSED,
+}
+
+MEDIA_CONTENT_TYPES = {"Music": MEDIA_TYPE_MUSIC, "Video": MEDIA_TYPE_VIDEO}
+
+PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(XBOXONE_SCHEMA)
+
+def _create_device(hass, config):
+    """
+    Build the entity without touching the network.
+
+    The first refresh is scheduled once the entity is added, in the
+    background, so setup never waits on the REST server.
+    """
+    return XboxOneDevice(
+        hass,
+        get_base_url(config),
+        config[CONF_DEVICE],
+        config[CONF_IP_ADDRESS],
+        config[CONF_NAME],
+        config[CONF_AUTHENTICATION],
+        config[CONF_CACHE_TTL],
+        config[CONF_PUSH],
+        config[CONF_POLL_INTERVAL],
+        config[CONF_METRICS],
+        config[CONF_SERVERS],
+    )
+
+
+@callback
+def _async_register_services():
+    entity_platform.async_get_current_platform().async_register_entity_service(
+        SERVICE_SEND_SEQUENCE,
+        SEND_SEQUENCE_SCHEMA,
+        "async_send_sequence",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the Xbox One platform from YAML."""
+    async_add_entities([_create_device(hass, config)])
+    _async_register_services()
+
+    if config[CONF_METRICS]:
+        hass.async_create_task(
+            async_load_platform(
+                hass,
+                "sensor",
+                DOMAIN,
+                {
+                    CONF_DEVICE: config[CONF_DEVICE],
+                    CONF_NAME: config[CONF_NAME],
+                    "base_urls": get_base_urls(config),
+                },
+                hass.data[DOMAIN][DATA_HASS_CONFIG],
+            )
+        )
 
 
-def setup_platform(hass, config, add_devices, discovery_info=None):
-    """Set up the Xbox One platform."""
-    name = config.get(CONF_NAME)
-    ssl = config.get(CONF_SSL)
-    host = config.get(CONF_HOST)
-    port = config.get(CONF_PORT)
-    liveid = config.get(CONF_DEVICE)
-    ip = config.get(CONF_IP_ADDRESS)
-    auth = config.get(CONF_AUTHENTICATION)
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up the Xbox One media player from a config entry."""
+    config = ENTRY_SCHEMA({**entry.data, **entry.options})
+    async_add_entities([_create_device(hass, config)])
+    _async_register_services()
 
-    proto = "https" if ssl else "http"
-    base_url = f"{proto}://{host}:{port}"
 
-    add_devices([XboxOneDevice(hass, base_url, liveid, ip, name, auth)])
+class ConnectionStateMachine:
+    """
+    Connection state of one console.
 
+    unavailable -> connecting -> connected, or -> backoff after a failed
+    connect. In backoff no connect is attempted until the jittered,
+    exponentially growing delay has passed. Time spent in every state is
+    accumulated for diagnostics.
+    """
 
-class XboxOne:
-    def __init__(self, hass, base_url, liveid, ip, auth):
-        self.is_server_up = False
-        self.is_server_correct_version = True
+    def __init__(
+        self, hass, base_delay=CONNECT_BACKOFF_BASE, max_delay=CONNECT_BACKOFF_MAX
+    ):
+        self._hass = hass
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.state = CONNECTION_UNAVAILABLE
+        self._entered_at = None
+        self._retry_at = None
+        self.failures = 0
+        self.transitions = Counter()
+        self.time_in_state = Counter()
+
+    def _set_state(self, state):
+        now = self._hass.loop.time()
+        if self._entered_at is not None:
+            self.time_in_state[self.state] += now - self._entered_at
+        self._entered_at = now
+        if state != self.state:
+            self.transitions[state] += 1
+            self.state = state
+
+    def set_unavailable(self):
+        if self.state != CONNECTION_UNAVAILABLE:
+            self._set_state(CONNECTION_UNAVAILABLE)
+
+    def set_connected(self):
+        self.failures = 0
+        self._retry_at = None
+        if self.state != CONNECTION_CONNECTED:
+            self._set_state(CONNECTION_CONNECTED)
+
+    def may_connect(self):
+        """Whether a connect is due now, entering connecting if it is"""
+        if (
+            self.state == CONNECTION_BACKOFF
+            and self._hass.loop.time() < self._retry_at
+        ):
+            return False
+        self._set_state(CONNECTION_CONNECTING)
+        return True
+
+    def connect_failed(self):
+        """Back off, returns the delay before the next attempt"""
+        self.failures += 1
+        delay = min(self._max_delay, self._base_delay * 2 ** (self.failures - 1))
+        delay = random.uniform(delay / 2, delay)
+        self._retry_at = self._hass.loop.time() + delay
+        self._set_state(CONNECTION_BACKOFF)
+        return delay
+
+    def reset_backoff(self):
+        """Allow a connect at the next refresh, e.g. after a power on"""
+        self.failures = 0
+        self._retry_at = None
+        if self.state == CONNECTION_BACKOFF:
+            self._set_state(CONNECTION_UNAVAILABLE)
+
+    def as_dict(self):
+        time_in_state = dict(self.time_in_state)
+        if self._entered_at is not None:
+            now = self._hass.loop.time()
+            time_in_state[self.state] = (
+                time_in_state.get(self.state, 0.0) + now - self._entered_at
+            )
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": (
+                max(self._retry_at - self._hass.loop.time(), 0)
+                if self.state == CONNECTION_BACKOFF
+                else None
+            ),
+            "transitions": dict(self.transitions),
+            "time_in_state": time_in_state,
+        }
 
+
+class XboxOne:
+    def __init__(
+        self,
+        hass,
+        base_url,
+        liveid,
+        ip,
+        auth,
+        cache_ttl=None,
+        push=False,
+        poll_interval=None,
+        metrics=False,
+        servers=None,
+    ):
         self.base_url = base_url
+        self._base_urls = [base_url, *(servers or ())]
+        self._selected_url = base_url
+        self._coordinators = None
         self._hass = hass
         self.liveid = liveid
         self._ip = ip
@@ -115,36 +412,230 @@ class XboxOne:
         self._available = False
         self._connected = False
         self._media_status = None
+        self._media_status_sampled_at = None
         self._console_status = None
         self._volume_controls = None
-        self._pins = None
+        self._media_commands = None
+        self._media_commands_key = None
+        self._catalog = {}
+        self._catalog_fingerprint = None
+        self._catalog_store = None
+        self._pins_task = None
         self._apps = {}
+        self._apps_index = {}
+        self._device_info = None
+        self._cache_ttl = {**DEFAULT_CACHE_TTL, **(cache_ttl or {})}
+        self._cache_expiry = {}
+        self._poll_interval = {**DEFAULT_POLL_INTERVAL, **(poll_interval or {})}
+        self._metrics = metrics
+        self._server_failures = 0
+        self._last_command_at = None
+        self._push = push
+        self._push_task = None
+        self._push_connected = False
+        self._listeners = []
+        self._in_flight = {}
+        self._validators = {}
+        self._refresh_lock = asyncio.Lock()
+        self._connection = ConnectionStateMachine(hass)
+        self._commands = deque()
+        self._command_task = None
+        self._command_stats = {
+            "commands": 0,
+            "batches": 0,
+            "coalesced": 0,
+            "busy_time": 0.0,
+            "wait_time": 0.0,
+            "max_latency": 0.0,
+        }
+        self._boot_task = None
+        self._boot_stats = {
+            "boots": 0,
+            "timeouts": 0,
+            "wake_requests": 0,
+            "last_time_to_usable": None,
+            "max_time_to_usable": None,
+        }
+        self._snapshot = XboxOneState(self)
+
+    def _is_cached(self, key):
+        expiry = self._cache_expiry.get(key)
+        return expiry is not None and self._hass.loop.time() < expiry
+
+    def _set_cached(self, key, ttl=None):
+        if ttl is None:
+            ttl = self._cache_ttl[key]
+        if ttl > 0:
+            self._cache_expiry[key] = self._hass.loop.time() + ttl
+
+    def invalidate(self, *keys):
+        """Force the given endpoints (default: all) to be fetched on next refresh"""
+        if not keys:
+            self._cache_expiry.clear()
+            keys = SHARED_CACHE_KEYS
+        for key in keys:
+            if key in SHARED_CACHE_KEYS:
+                for coordinator in self.coordinators:
+                    coordinator.invalidate(key)
+            else:
+                self._cache_expiry.pop(key, None)
 
-    async def get(self, endpoint, **kwargs):
-        endpoint = endpoint.replace("<liveid>", self.liveid)
-        full_url = urljoin(self.base_url, endpoint)
+    @property
+    def coordinators(self):
+        """Coordinators of every configured REST server, primary first"""
+        if self._coordinators is None:
+            self._coordinators = [
+                async_get_coordinator(self._hass, url) for url in self._base_urls
+            ]
+            if self._metrics:
+                for coordinator in self._coordinators:
+                    coordinator.enable_metrics()
+        return self._coordinators
+
+    @staticmethod
+    def _server_rank(coordinator):
+        return (
+            not coordinator.server_available,
+            coordinator.breaker.failures > 0,
+            coordinator.latency is None,
+        )
 
-        try:
-            partial_req = partial(requests.get, full_url, **kwargs)
-            response = await self._hass.loop.run_in_executor(None, partial_req)
+    @property
+    def coordinator(self):
+        """
+        Coordinator of the REST server requests go to.
 
-            if response.status_code != 200:
-                _LOGGER.warning(
-                    "Invalid status_code %s from url %s", response.status_code, full_url
-                )
-                _LOGGER.warning(response.text)
-                return {}
+        With standby servers, a healthy server is preferred over a failing
+        one, then the fastest one. The current server is kept unless another
+        is clearly faster, so requests don't flap between similar servers.
+        """
+        coordinators = self.coordinators
+        if len(coordinators) == 1:
+            return coordinators[0]
+
+        current = coordinators[self._base_urls.index(self._selected_url)]
+        best = min(
+            coordinators,
+            key=lambda c: (*self._server_rank(c), c.latency or 0),
+        )
+        current_rank, best_rank = self._server_rank(current), self._server_rank(best)
+        if best is current or best_rank > current_rank:
+            return current
+        if best_rank == current_rank and (
+            best.latency is None
+            or best.latency >= current.latency * SERVER_SWITCH_RATIO
+        ):
+            return current
 
-            json_response = response.json()
+        _LOGGER.info(
+            "Console %s switched from REST server %s to %s",
+            self.liveid,
+            current.base_url,
+            best.base_url,
+        )
+        self._selected_url = best.base_url
+        return best
 
-        except requests.exceptions.RequestException:
-            _LOGGER.warning("Request failed for url %s", full_url)
-            return {}
-        except ValueError:
-            _LOGGER.warning("Unable to parse JSON from response")
-            return {}
+    @property
+    def session(self):
+        return self.coordinator.session
 
-        return json_response
+    @property
+    def is_server_up(self):
+        return self.coordinator.is_server_up
+
+    @property
+    def server_available(self):
+        return self.coordinator.server_available
+
+    @property
+    def is_server_correct_version(self):
+        return self.coordinator.is_server_correct_version
+
+    async def get(self, endpoint, params=None, failover=False, validator=None):
+        """
+        GET from the current REST server.
+
+        With failover, a request the server failed to answer is repeated on
+        the next best server. Only safe for reads, a command could have
+        reached the console before the server failed.
+        """
+        template = endpoint.replace(self.liveid, "<liveid>")
+        endpoint = template.replace("<liveid>", self.liveid)
+        if template.startswith("/device/<liveid>/launch/"):
+            template = "/device/<liveid>/launch/<uri>"
+
+        coordinator = self.coordinator
+        response = await coordinator.get(
+            endpoint,
+            params=params,
+            template=template,
+            validator=validator,
+            liveid=self.liveid,
+        )
+        if response or not failover or not coordinator.breaker.failures:
+            return response
+
+        fallback = self.coordinator
+        if fallback is coordinator:
+            return response
+        return await fallback.get(
+            endpoint,
+            params=params,
+            template=template,
+            validator=validator,
+            liveid=self.liveid,
+        )
+
+    async def fetch(self, endpoint, params=None, validator=None):
+        """
+        GET a read-only endpoint.
+
+        Concurrent identical requests, e.g. a poll and a command both reading
+        /ir, share one in-flight request. Commands use get, every call of
+        which reaches the console.
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())), validator is None)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = self._hass.loop.create_task(
+                self.get(endpoint, params=params, failover=True, validator=validator)
+            )
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    def as_dict(self):
+        """Diagnostics of this console"""
+        return {
+            "available": self.available,
+            "connected": self.connected,
+            "connection": self._connection.as_dict(),
+            "server": self.coordinator.base_url,
+            "state": self._snapshot.state,
+            "active_app": self._snapshot.active_app,
+            "poll_interval": self.poll_interval,
+            "push_connected": self.push_connected,
+            "cached": sorted(self._cache_expiry),
+            "commands": self.command_stats,
+            "poweron": self.poweron_stats,
+            "memory": self.memory_usage,
+        }
+
+    @property
+    def memory_usage(self):
+        """Approximate bytes held per retained response and table"""
+        usage = {
+            "device_info": deep_sizeof(self._device_info),
+            "console_status": deep_sizeof(self._console_status),
+            "media_status": deep_sizeof(self._media_status),
+            "volume_controls": deep_sizeof(self._volume_controls),
+            "media_commands": deep_sizeof(self._media_commands),
+            "catalog": deep_sizeof(self._catalog),
+            "apps": deep_sizeof(self._apps) + deep_sizeof(self._apps_index),
+        }
+        usage["total"] = sum(usage.values())
+        return usage
 
     @property
     def available(self):
@@ -178,6 +669,10 @@ class XboxOne:
             "down": controls["buttons"]["btn.vol_down"]["url"],
         }
 
+    @property
+    def media_status_sampled_at(self):
+        return self._media_status_sampled_at
+
     @property
     def media_playback_state(self):
         if self.media_status:
@@ -210,80 +705,136 @@ class XboxOne:
             return self.media_status.get("metadata", {}).get("title")
 
     @property
-    def active_app(self):
+    def focused_title(self):
         if self.console_status:
-            active_titles = self.console_status.get("active_titles")
-            app = [a.get("name") for a in active_titles if a.get("has_focus")]
-            if len(app):
-                return app[0]
+            for app in self.console_status.get("active_titles") or ():
+                if app.get("has_focus"):
+                    return app
+
+    @property
+    def active_app(self):
+        app = self.focused_title
+        if app:
+            return app.get("name")
 
     @property
     def active_app_image(self):
-        if self.console_status:
-            active_titles = self.console_status.get("active_titles")
-            app = [a.get("image") for a in active_titles if a.get("has_focus")]
-            if len(app):
-                return app[0] or None
+        app = self.focused_title
+        if app:
+            return app.get("image") or None
 
     @property
     def active_app_type(self):
-        if self.console_status:
-            active_titles = self.console_status.get("active_titles")
-            app = [a.get("type") for a in active_titles if a.get("has_focus")]
-            if len(app):
-                return app[0]
+        app = self.focused_title
+        if app:
+            return app.get("type")
+
+    @property
+    def snapshot(self):
+        return self._snapshot
 
     @property
     def all_apps(self):
         return self._apps
 
-    async def _refresh_all_apps(self):
-        apps = {"Home": "ms-xbox-dashboard://home?view=home", "TV": "ms-xbox-livetv://"}
+    @staticmethod
+    def _normalize_title(title):
+        return " ".join(str(title).casefold().split())
 
-        if not self._pins and await self._check_authentication():
-            self._pins = await self.get("/web/pins")
+    def _build_apps(self):
+        apps = dict(DEFAULT_APPS)
+        for title, aumid in self._catalog.items():
+            apps.setdefault(title, aumid)
 
-        if self._pins:
-            try:
-                for item in self._pins["ListItems"]:
-                    if (
-                        item["Item"]["ContentType"] == "DApp"
-                        and item["Item"]["Title"] not in apps.keys()
-                    ):
-                        apps[item["Item"]["Title"]] = "appx:{0}!App".format(
-                            item["Item"]["ItemId"]
-                        )
-            except:
-                pass
-
-        if self.console_status:
-            active_titles = self.console_status.get("active_titles")
-            for app in active_titles:
-                if app.get("has_focus") and app.get("name") not in apps.keys():
-                    apps[app.get("name")] = app.get("aum")
+        focused = self.focused_title
+        if focused and focused.get("name") not in apps.keys():
+            apps[focused.get("name")] = focused.get("aum")
 
         self._apps = apps
-
+        self._apps_index = {
+            self._normalize_title(title): aumid for title, aumid in apps.items() if title
+        }
         return apps
 
-    async def _check_authentication(self):
+    @property
+    def _apps_store(self):
+        if self._catalog_store is None:
+            self._catalog_store = Store(
+                self._hass,
+                STORAGE_VERSION,
+                STORAGE_KEY_APPS.format(liveid=self.liveid),
+            )
+        return self._catalog_store
 
-        response = await self.get("/auth")
-        if response.get("authenticated"):
-            return True
+    async def async_load_apps(self):
+        """Restore the pinned app catalog saved by a previous run"""
+        data = await self._apps_store.async_load()
+        if not data:
+            return
 
-        response = await self.get("/auth/refresh")
-        if response.get("success"):
-            return True
+        self._catalog = data.get("apps") or {}
+        self._catalog_fingerprint = data.get("fingerprint")
+        self._build_apps()
+        self._update_snapshot()
 
-        _LOGGER.error("Refreshing authentication tokens failed!")
-        return False
+    async def _refresh_all_apps(self):
+        if not self._is_cached(CACHE_PINS) and (
+            self._pins_task is None or self._pins_task.done()
+        ):
+            # The catalog at hand is good enough for this refresh
+            self._pins_task = self._hass.loop.create_task(self._refresh_pins())
+
+        return self._build_apps()
+
+    async def _refresh_pins(self):
+        request_priority.set(PRIORITY_BACKGROUND)
+        if not await self._check_authentication():
+            return
+
+        pins = await self.get("/web/pins")
+        if not pins:
+            return
+
+        catalog = {}
+        try:
+            for item in pins["ListItems"]:
+                if (
+                    item["Item"]["ContentType"] == "DApp"
+                    and item["Item"]["Title"] not in catalog.keys()
+                ):
+                    catalog[item["Item"]["Title"]] = "appx:{0}!App".format(
+                        item["Item"]["ItemId"]
+                    )
+        except (KeyError, TypeError):
+            _LOGGER.warning("Unexpected /web/pins response for %s", self.liveid)
+            return
+
+        self._set_cached(CACHE_PINS)
+        fingerprint = hashlib.sha1(
+            json.dumps(catalog, sort_keys=True).encode()
+        ).hexdigest()
+        if fingerprint == self._catalog_fingerprint:
+            return
+
+        self._catalog = catalog
+        self._catalog_fingerprint = fingerprint
+        self._apps_store.async_delay_save(
+            lambda: {"apps": self._catalog, "fingerprint": self._catalog_fingerprint},
+            APPS_SAVE_DELAY,
+        )
+        self._build_apps()
+        if self._update_snapshot():
+            self._notify_listeners()
+
+    async def _check_authentication(self):
+        return await self.coordinator.async_check_authentication(
+            self._cache_ttl[CACHE_AUTH]
+        )
 
     async def _refresh_devicelist(self):
-        params = None
-        if self._ip:
-            params = {"addr": self._ip}
-        await self.get("/device", params=params)
+        await self.coordinator.async_refresh_devicelist(
+            self._ip or None, self._cache_ttl[CACHE_DEVICELIST]
+        )
 
     async def _connect(self):
         if self._auth and not await self._check_authentication():
@@ -293,70 +844,371 @@ class XboxOne:
         params = {}
         if not self._auth:
             params["anonymous"] = True
+        # Connecting changes console state, so it is neither shared nor replayed
         response = await self.get(url, params=params)
         if not response.get("success"):
-            _LOGGER.error(
-                "Failed to connect to console {0}: {1}".format(
-                    self.liveid, str(response)
-                )
-            )
+            _LOGGER.debug("Failed to connect to console %s: %s", self.liveid, response)
             return False
 
         return True
 
     async def _get_device_info(self):
-
-        response = await self.get("/device/<liveid>")
+        if self._is_cached(CACHE_DEVICE_INFO):
+            return self._device_info
+
+        # Consoles the shared enumeration reports as off need no request
+        enumerated = self.coordinator.enumerated_device(
+            self.liveid, self._ip or None, self._cache_ttl[CACHE_DEVICELIST]
+        )
+        if enumerated and enumerated.get("device_status") == "Unavailable":
+            self._device_info = enumerated
+            return enumerated
+
+        response = await self.fetch("/device/<liveid>")
         # _LOGGER.warn(response)
         if not response.get("success"):
             _LOGGER.debug(f"Console {self.liveid} not available")
+            self._device_info = None
             return None
 
-        return response["device"]
+        self._device_info = extract_fields(response["device"], DEVICE_INFO_FIELDS)
+        self._set_cached(CACHE_DEVICE_INFO)
+        return self._device_info
+
+    def _validator(self, key, data):
+        """Conditional request state for key, reset while there is no data"""
+        if data is None:
+            self._validators[key] = {}
+        return self._validators.setdefault(key, {})
 
     async def _update_console_status(self):
+        if self._is_cached(CACHE_CONSOLE_STATUS):
+            return
 
-        response = await self.get("/device/<liveid>/console_status")
+        response = await self.fetch(
+            "/device/<liveid>/console_status",
+            validator=self._validator(CACHE_CONSOLE_STATUS, self._console_status),
+        )
         if not response.get("success"):
             _LOGGER.error(f"Console {self.liveid} not available")
             return None
 
-        self._console_status = response["console_status"]
+        if response is not NOT_MODIFIED:
+            self._console_status = extract_fields(
+                response["console_status"], CONSOLE_STATUS_FIELDS
+            )
+        self._set_cached(CACHE_CONSOLE_STATUS)
 
     async def _update_media_status(self):
+        if self._is_cached(CACHE_MEDIA_STATUS):
+            return
 
-        response = await self.get("/device/<liveid>/media_status")
+        response = await self.fetch(
+            "/device/<liveid>/media_status",
+            validator=self._validator(CACHE_MEDIA_STATUS, self._media_status),
+        )
         if not response.get("success"):
             _LOGGER.error(f"Console {self.liveid} not available")
             return None
 
-        self._media_status = response["media_status"]
+        # An unchanged body means playback did not move, the last sample holds
+        if response is not NOT_MODIFIED:
+            self._media_status = extract_fields(
+                response["media_status"], MEDIA_STATUS_FIELDS
+            )
+            self._media_status_sampled_at = dt_util.utcnow()
+        self._set_cached(CACHE_MEDIA_STATUS)
 
     async def _update_volume_controls(self):
-        if self._volume_controls:
+        if self._volume_controls and self._is_cached(CACHE_IR):
             return
 
-        response = await self.get("/device/<liveid>/ir")
+        await self._fetch_ir_controls()
+
+    async def _fetch_ir_controls(self):
+        response = await self.fetch("/device/<liveid>/ir")
         if not response.get("success"):
             _LOGGER.error(f"Console {self.liveid} not available")
             return None
 
-        self._volume_controls = response
+        self._volume_controls = extract_fields(response, IR_FIELDS)
+        self._set_cached(CACHE_IR)
 
-    async def poweron(self):
+    @property
+    def _media_session_key(self):
+        """Identifies the focused title and media session the commands apply to"""
+        media_status = self.media_status or {}
+        return (
+            self.active_app,
+            media_status.get("title_id"),
+            media_status.get("aum_id"),
+        )
+
+    async def _update_media_commands(self):
+        """Refresh the media command table when the title or session changed"""
+        if (
+            self._media_commands is not None
+            and self._media_commands_key == self._media_session_key
+        ):
+            return
+
+        await self._fetch_media_commands()
+
+    async def _fetch_media_commands(self):
+        key = self._media_session_key
+        response = await self.fetch("/device/<liveid>/media")
+        if not response.get("success"):
+            self._media_commands = None
+            return None
+
+        self._media_commands = frozenset(response.get("commands") or ())
+        self._media_commands_key = key
+
+    def _ir_button_url(self, device, command):
+        buttons = ((self._volume_controls or {}).get(device) or {}).get("buttons")
+        if not buttons or command not in buttons:
+            return None
+        return buttons[command].get("url")
+
+    def _media_command_url(self, command):
+        if not self._media_commands or command not in self._media_commands:
+            return None
+        return f"/device/<liveid>/media/{command}"
+
+    def _volume_command_url(self, command):
+        return (self.volume_controls or {}).get(command)
+
+    async def _send_command(self, resolve_url, revalidate):
+        """
+        Send a command straight to its cached url.
+
+        The capability table is only fetched when the command is unknown, or
+        once more if the server rejects the command, followed by a single retry.
+        A request that got no answer is not retried, the console may already
+        have acted on it.
+        """
+        revalidated = False
+        url = resolve_url()
+        if url is None:
+            await revalidate()
+            revalidated = True
+            url = resolve_url()
+            if url is None:
+                return None
+
+        response = await self.get(url)
+        if response.get("success"):
+            return response
+
+        # Only an answer with success false is a rejection, {} is a failure
+        if revalidated or "success" not in response:
+            return None
+
+        await revalidate()
+        url = resolve_url()
+        if url is None:
+            return None
 
-        url = "/device/<liveid>/poweron"
+        response = await self.get(url)
+        if not response.get("success"):
+            return None
+
+        return response
+
+    @callback
+    def queue_command(self, command, *args, step=False):
+        """
+        Queue command(*args) behind the commands already pending.
+
+        Consecutive identical step commands (volume and channel up/down) are
+        coalesced into one batch whose requests are sent concurrently, so
+        quick presses don't wait for each other's round-trip. Returns a future
+        resolving to the command's response.
+        """
+        loop = self._hass.loop
+        future = loop.create_future()
+        key = (command, args) if step else None
+        self._last_command_at = loop.time()
+        self._commands.append((key, partial(command, *args), future, loop.time()))
+        if self._command_task is None or self._command_task.done():
+            self._command_task = loop.create_task(self._process_commands())
+        return future
+
+    async def _process_commands(self):
+        # Runs as its own task, every request it makes is a command
+        request_priority.set(PRIORITY_COMMAND)
+        loop = self._hass.loop
+        stats = self._command_stats
+        while self._commands:
+            key = self._commands[0][0]
+            if key is not None:
+                # Give the rest of a burst the chance to arrive
+                await asyncio.sleep(COMMAND_COALESCE_WINDOW)
+
+            batch = [self._commands.popleft()]
+            while key is not None and self._commands and self._commands[0][0] == key:
+                batch.append(self._commands.popleft())
+
+            started = loop.time()
+            results = await asyncio.gather(
+                *(send() for _, send, _, _ in batch), return_exceptions=True
+            )
+            finished = loop.time()
+
+            for (_, _, future, queued_at), result in zip(batch, results):
+                stats["wait_time"] += started - queued_at
+                stats["max_latency"] = max(stats["max_latency"], finished - queued_at)
+                if isinstance(result, BaseException):
+                    _LOGGER.error("Command for %s failed: %s", self.liveid, result)
+                    result = None
+                if not future.done():
+                    future.set_result(result)
+
+            stats["commands"] += len(batch)
+            stats["batches"] += 1
+            stats["coalesced"] += len(batch) - 1
+            stats["busy_time"] += finished - started
+            _LOGGER.debug(
+                "Sent %d command(s) to %s in %.3fs",
+                len(batch),
+                self.liveid,
+                finished - started,
+            )
+
+    @property
+    def poll_interval(self):
+        """
+        Seconds until this console should be polled again.
+
+        Fast while media plays or right after a command, slow while the console
+        is off, and backing off exponentially while the server is unreachable.
+        """
+        intervals = self._poll_interval
+        if self._server_failures:
+            return min(
+                intervals[POLL_IDLE] * 2 ** self._server_failures,
+                intervals[POLL_MAX_BACKOFF],
+            )
+
+        if self._push_connected:
+            return PUSH_POLL_INTERVAL
+
+        if (
+            self._last_command_at is not None
+            and self._hass.loop.time() - self._last_command_at < COMMAND_ACTIVE_WINDOW
+        ):
+            return intervals[POLL_ACTIVE]
+
+        state = self._snapshot.state
+        if state == STATE_PLAYING:
+            return intervals[POLL_ACTIVE]
+        if state == STATE_OFF:
+            return intervals[POLL_OFF]
+        return intervals[POLL_IDLE]
+
+    @property
+    def command_stats(self):
+        """Throughput and latency of the command queue"""
+        stats = self._command_stats
+        commands = stats["commands"]
+        return {
+            "commands": commands,
+            "batches": stats["batches"],
+            "coalesced": stats["coalesced"],
+            "pending": len(self._commands),
+            "avg_wait": stats["wait_time"] / commands if commands else None,
+            "max_latency": stats["max_latency"],
+            "throughput": commands / stats["busy_time"] if stats["busy_time"] else None,
+        }
+
+    async def _send_poweron(self):
+        self._boot_stats["wake_requests"] += 1
         params = None
         if self._ip:
             params = {"addr": self._ip}
-        response = await self.get(url, params=params)
+        return await self.get("/device/<liveid>/poweron", params=params)
+
+    async def poweron(self):
+        self.invalidate(CACHE_DEVICELIST, CACHE_DEVICE_INFO)
+
+        response = await self._send_poweron()
         if not response.get("success"):
             _LOGGER.error(f"Failed to poweron {self.liveid}")
             return None
 
+        # Connect as soon as the console shows up instead of after a backoff
+        self._connection.reset_backoff()
+        if self._boot_task is None or self._boot_task.done():
+            self._boot_task = self._hass.loop.create_task(self._wait_for_boot())
         return response
 
+    async def _wait_for_boot(self):
+        """
+        Follow a power on until the console is usable.
+
+        Wake packets get lost while the console is in deep standby, so the
+        request is resent. The device list is probed until the console shows
+        up, then it is connected and its status fetched right away instead of
+        at the next regular poll.
+        """
+        # Started from the command worker, but probing is polling
+        request_priority.set(PRIORITY_POLL)
+        loop = self._hass.loop
+        started = loop.time()
+        next_wake = started + POWERON_RESEND_INTERVAL
+        addr = self._ip or None
+
+        while loop.time() - started < POWERON_TIMEOUT:
+            await asyncio.sleep(POWERON_PROBE_INTERVAL)
+            await self.coordinator.async_refresh_devicelist(addr, 0)
+            device = self.coordinator.enumerated_device(
+                self.liveid, addr, POWERON_PROBE_INTERVAL
+            )
+            if device and device.get("device_status") == "Available":
+                break
+            if loop.time() >= next_wake:
+                next_wake = loop.time() + POWERON_RESEND_INTERVAL
+                await self._send_poweron()
+        else:
+            self._boot_stats["timeouts"] += 1
+            _LOGGER.warning(
+                "Console %s did not come up within %s s", self.liveid, POWERON_TIMEOUT
+            )
+            return
+
+        self.invalidate(CACHE_DEVICE_INFO, CACHE_CONSOLE_STATUS, CACHE_MEDIA_STATUS)
+        if await self.refresh():
+            self._notify_listeners()
+        if not self.connected:
+            return
+
+        elapsed = loop.time() - started
+        stats = self._boot_stats
+        stats["boots"] += 1
+        stats["last_time_to_usable"] = elapsed
+        stats["max_time_to_usable"] = max(stats["max_time_to_usable"] or 0, elapsed)
+        _LOGGER.debug("Console %s usable %.1f s after power on", self.liveid, elapsed)
+
+    @property
+    def poweron_stats(self):
+        return {**self._boot_stats, "booting": self.booting}
+
+    @property
+    def booting(self):
+        return self._boot_task is not None and not self._boot_task.done()
+
+    async def async_cancel_poweron(self):
+        if self._boot_task is None:
+            return
+        self._boot_task.cancel()
+        try:
+            await self._boot_task
+        except asyncio.CancelledError:
+            pass
+        self._boot_task = None
+
     async def poweroff(self):
+        self.invalidate(CACHE_DEVICE_INFO)
 
         response = await self.get("/device/<liveid>/poweroff")
         if not response.get("success"):
@@ -365,140 +1217,674 @@ class XboxOne:
         return response
 
     async def ir_command(self, device, command):
+        self.invalidate(CACHE_CONSOLE_STATUS, CACHE_MEDIA_STATUS)
 
-        response = await self.get("/device/<liveid>/ir")
-        if not response.get("success"):
-            return None
-
-        enabled_commands = response.get(device).get("buttons")
-        if command not in enabled_commands:
+        response = await self._send_command(
+            partial(self._ir_button_url, device, command), self._fetch_ir_controls
+        )
+        if response is None and self._ir_button_url(device, command) is None:
             _LOGGER.error(
                 f"Provided command {command} not enabled for current ir device"
             )
-            return None
-        else:
-            button_url = enabled_commands.get(command).get("url")
-
-        response = await self.get("{0}".format(button_url))
-        if not response.get("success"):
-            return None
 
         return response
 
     async def media_command(self, command):
+        self.invalidate(CACHE_CONSOLE_STATUS, CACHE_MEDIA_STATUS)
 
-        response = await self.get("/device/<liveid>/media")
-        if not response.get("success"):
-            return None
-
-        enabled_commands = response.get("commands")
-        if command not in enabled_commands:
+        response = await self._send_command(
+            partial(self._media_command_url, command), self._fetch_media_commands
+        )
+        if response is None and self._media_command_url(command) is None:
             _LOGGER.error(f"Provided command {command} not enabled for current media")
-            return None
-
-        response = await self.get(f"/device/<liveid>/media/{command}")
-        if not response.get("success"):
-            return None
 
         return response
 
     async def volume_command(self, command):
-        if not self._volume_controls:
-            return None
+        self.invalidate(CACHE_CONSOLE_STATUS, CACHE_MEDIA_STATUS)
 
-        url = self._volume_controls.get(command)
-
-        if not url:
-            return None
-
-        response = await self.get(url)
-        if not response.get("success"):
-            return None
-
-        return response
+        return await self._send_command(
+            partial(self._volume_command_url, command), self._fetch_ir_controls
+        )
 
     async def launch_title(self, launch_uri):
+        self.invalidate(CACHE_CONSOLE_STATUS, CACHE_MEDIA_STATUS)
 
         apps = self.all_apps
         if launch_uri in apps.keys():
             launch_uri = apps[launch_uri]
+        else:
+            launch_uri = self._apps_index.get(
+                self._normalize_title(launch_uri), launch_uri
+            )
         response = await self.get(f"/device/<liveid>/launch/{launch_uri}")
         if not response.get("success"):
             return None
 
         return response
 
+    async def send_sequence(self, steps):
+        """
+        Run steps in order, stopping at the first one that fails.
+
+        Auth and the capability tables the steps need are checked once up
+        front, so every command step costs a single request. Command steps go
+        through the command queue and keep their order with other commands.
+        Returns the outcome and duration of every step.
+        """
+        # The table fetches and title checks are part of the commands, reset
+        # afterwards as this runs in the caller's task
+        token = request_priority.set(PRIORITY_COMMAND)
+        try:
+            return await self._send_sequence(steps)
+        finally:
+            request_priority.reset(token)
+
+    async def _send_sequence(self, steps):
+        loop = self._hass.loop
+        started = loop.time()
+        actions = [self._step_action(step) for step in steps]
+
+        if self._auth:
+            await self._check_authentication()
+        if STEP_IR in actions and self._volume_controls is None:
+            await self._fetch_ir_controls()
+        if STEP_MEDIA in actions and self._media_commands is None:
+            await self._fetch_media_commands()
+
+        results = []
+        success = True
+        for index, (action, step) in enumerate(zip(actions, steps)):
+            step_started = loop.time()
+            success = await self._run_step(action, step)
+            results.append(
+                {
+                    "step": index,
+                    "action": action,
+                    "target": str(step[action]),
+                    "success": success,
+                    "duration": round(loop.time() - step_started, 3),
+                }
+            )
+            if not success:
+                break
+
+        if self._update_snapshot():
+            self._notify_listeners()
+
+        return {
+            "success": success,
+            "duration": round(loop.time() - started, 3),
+            "steps": results,
+        }
+
+    @staticmethod
+    def _step_action(step):
+        for action in (STEP_LAUNCH, STEP_MEDIA, STEP_IR, STEP_DELAY):
+            if action in step:
+                return action
+        return STEP_WAIT_FOR_TITLE
+
+    async def _run_step(self, action, step):
+        target = step[action]
+        if action == STEP_DELAY:
+            await asyncio.sleep(target.total_seconds())
+            return True
+        if action == STEP_WAIT_FOR_TITLE:
+            return await self._wait_for_title(target, step[ATTR_TIMEOUT])
+
+        if action == STEP_LAUNCH:
+            future = self.queue_command(self.launch_title, target)
+        elif action == STEP_MEDIA:
+            future = self.queue_command(self.media_command, target)
+        else:
+            future = self.queue_command(self.ir_command, step[ATTR_IR_DEVICE], target)
+        return await future is not None
+
+    async def _wait_for_title(self, title, timeout):
+        """Poll the console status until title (name or AUMID) has focus"""
+        wanted = {self._normalize_title(title)}
+        aumid = self._apps_index.get(self._normalize_title(title))
+        if aumid:
+            wanted.add(self._normalize_title(aumid))
+
+        deadline = self._hass.loop.time() + timeout
+        while True:
+            self.invalidate(CACHE_CONSOLE_STATUS)
+            await self._update_console_status()
+            app = self.focused_title
+            if app and wanted & {
+                self._normalize_title(app.get("name")),
+                self._normalize_title(app.get("aum")),
+            }:
+                return True
+            if self._hass.loop.time() + WAIT_FOR_TITLE_INTERVAL > deadline:
+                return False
+            await asyncio.sleep(WAIT_FOR_TITLE_INTERVAL)
+
     async def _check_server(self):
-        if not self.is_server_correct_version:
-            return False
+        coordinator = self.coordinator
+        if len(self.coordinators) > 1:
+            for standby in self.coordinators:
+                standby.async_probe()
+
+        if await coordinator.async_check_server(self._cache_ttl[CACHE_VERSIONS]):
+            return True
 
-        response = await self.get("/versions")
-        if not response:
-            self.is_server_up = False
+        # Fail over right away if another server is healthier
+        fallback = self.coordinator
+        if fallback is coordinator:
             return False
+        return await fallback.async_check_server(self._cache_ttl[CACHE_VERSIONS])
 
-        lib_version = response["versions"]["xbox-smartglass-core"]
-        if version.parse(lib_version) < version.parse(MIN_REQUIRED_SERVER_VERSION):
-            self.is_server_correct_version = False
-            _LOGGER.error(
-                "Invalid xbox-smartglass-core version: %s. Min Required: %s",
-                lib_version,
-                MIN_REQUIRED_SERVER_VERSION,
+    @property
+    def push_connected(self):
+        return self._push_connected
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Register a callback for pushed state changes, returns a remover"""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _notify_listeners(self):
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_start_push(self):
+        if self._push and self._push_task is None:
+            self._push_task = self._hass.loop.create_task(self._push_loop())
+
+    async def async_stop_push(self):
+        if self._push_task is None:
+            return
+        self._push_task.cancel()
+        try:
+            await self._push_task
+        except asyncio.CancelledError:
+            pass
+        self._push_task = None
+
+    async def _push_loop(self):
+        """
+        Keep the event stream of the REST server open.
+
+        While the stream is up, console and media status are not polled and
+        the rest is polled every PUSH_POLL_INTERVAL. When it drops, regular
+        polling takes over until the stream could be reopened.
+        """
+        endpoint = PUSH_ENDPOINT.replace("<liveid>", self.liveid)
+
+        while True:
+            # Follow a failover, the server may have changed since the last try
+            base_url = self.coordinator.base_url
+            ws_url = urljoin(base_url, endpoint).replace("http", "ws", 1)
+            try:
+                async with self.session.ws_connect(
+                    ws_url, heartbeat=PUSH_HEARTBEAT
+                ) as ws:
+                    _LOGGER.debug("Push updates for %s connected", self.liveid)
+                    self._push_connected = True
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._apply_push(msg.json(loads=json_loads))
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                _LOGGER.debug("Push updates for %s unavailable: %s", self.liveid, err)
+            finally:
+                if self._push_connected:
+                    self._push_connected = False
+                    self._notify_listeners()
+
+            await asyncio.sleep(PUSH_RECONNECT_DELAY)
+
+    @callback
+    def _apply_push(self, message):
+        """Merge a console/media status delta, notify listeners on change"""
+        if not isinstance(message, dict):
+            return
+
+        changed = False
+        console_status = message.get("console_status")
+        if isinstance(console_status, dict):
+            console_status = extract_fields(console_status, CONSOLE_STATUS_FIELDS)
+            merged = {**(self._console_status or {}), **console_status}
+            if merged != self._console_status:
+                self._console_status = merged
+                self._validators.pop(CACHE_CONSOLE_STATUS, None)
+                changed = True
+
+        media_status = message.get("media_status")
+        if isinstance(media_status, dict):
+            media_status = extract_fields(media_status, MEDIA_STATUS_FIELDS)
+            merged = {**(self._media_status or {}), **media_status}
+            if merged != self._media_status:
+                self._media_status = merged
+                # Only a new position is a new sample, the old one holds
+                if "position" in media_status:
+                    self._media_status_sampled_at = dt_util.utcnow()
+                self._validators.pop(CACHE_MEDIA_STATUS, None)
+                changed = True
+
+        if changed and self._update_snapshot():
+            self._notify_listeners()
+
+    def _snapshot_inputs(self):
+        """Everything the app list and the snapshot are derived from"""
+        return (
+            self.server_available,
+            self._available,
+            self._connected,
+            self._console_status,
+            self._media_status,
+            self._media_status_sampled_at,
+            self._volume_controls,
+            self._catalog,
+        )
+
+    def _update_snapshot(self):
+        """Rebuild the snapshot, returns True if anything visible changed"""
+        previous = self._snapshot
+        self._snapshot = XboxOneState(self, previous)
+        return self._snapshot != previous
+
+    async def _run_until(self, deadline, *coros):
+        """
+        Run coroutines concurrently until the refresh deadline.
+
+        Returns one result per coroutine, None for those that failed or did not
+        finish in time. Unfinished coroutines are cancelled.
+        """
+        loop = self._hass.loop
+        tasks = [loop.create_task(coro) for coro in coros]
+        done, pending = await asyncio.wait(
+            tasks, timeout=max(deadline - loop.time(), 0)
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            _LOGGER.debug(
+                "Refresh deadline hit for %s, %d request(s) cancelled",
+                self.liveid,
+                len(pending),
             )
 
-        self.is_server_up = True
-        return True
+        results = []
+        for task in tasks:
+            if task not in done:
+                results.append(None)
+            elif task.exception() is not None:
+                _LOGGER.error(
+                    "Refresh step failed for %s: %s", self.liveid, task.exception()
+                )
+                results.append(None)
+            else:
+                results.append(task.result())
+        return results
+
+    async def _authenticate_and_refresh_apps(self):
+        await self._check_authentication()
+        return await self._refresh_all_apps()
+
+    async def _enumerate_and_get_device_info(self):
+        await self._refresh_devicelist()
+        return await self._get_device_info()
 
     async def refresh(self):
         """
         Enumerate devices and refresh status info
+
+        Returns True if the state shown by the entity changed. Overlapping
+        refreshes of the console run one after the other.
+        """
+        async with self._refresh_lock:
+            return await self._timed_refresh()
+
+    async def _timed_refresh(self):
+        started = self._hass.loop.time()
+        inputs = self._snapshot_inputs()
+        try:
+            await self._refresh()
+        finally:
+            # Unchanged responses keep their objects, nothing to recompute
+            changed = False
+            if any(a is not b for a, b in zip(inputs, self._snapshot_inputs())):
+                self._build_apps()
+                changed = self._update_snapshot()
+            # Kept by the primary server, whichever one answered
+            metrics = self.coordinators[0].metrics
+            if metrics is not None:
+                metrics.record_refresh(self.liveid, self._hass.loop.time() - started)
+        return changed
+
+    async def _refresh(self):
+        """
+        Independent requests run concurrently, dependent ones are chained:
+        auth -> pins, enumeration -> device info -> connect, and once connected
+        console status, media status and IR controls are fetched together.
+        The whole chain shares one deadline; results of requests that finished
+        in time are applied, the rest are cancelled.
         """
+        deadline = self._hass.loop.time() + REFRESH_DEADLINE
 
-        if not await self._check_server():
+        (server_ok,) = await self._run_until(deadline, self._check_server())
+        if not server_ok:
+            self._server_failures += 1
             return
+        self._server_failures = 0
 
-        await self._check_authentication()
-        await self._refresh_devicelist()
-        await self._refresh_all_apps()
+        _, device_info = await self._run_until(
+            deadline,
+            self._authenticate_and_refresh_apps(),
+            self._enumerate_and_get_device_info(),
+        )
+
+        if self._hass.loop.time() >= deadline:
+            # Device state is unknown, keep what we had
+            return
 
-        device_info = await self._get_device_info()
         if not device_info or device_info.get("device_status") == "Unavailable":
+            self.invalidate(CACHE_DEVICE_INFO, CACHE_CONSOLE_STATUS, CACHE_MEDIA_STATUS)
             self._available = False
             self._connected = False
+            self._connection.set_unavailable()
             self._console_status = None
             self._media_status = None
             self._volume_controls = None
+            self._media_commands = None
         else:
             self._available = True
 
             connection_state = device_info.get("connection_state")
             if connection_state == "Connected":
                 self._connected = True
-            else:
-                success = await self._connect()
-                if not success:
-                    _LOGGER.error(f"Failed to connect to {self.liveid}")
-                    self._connected = False
-                else:
+                self._connection.set_connected()
+            elif self._connection.may_connect():
+                (success,) = await self._run_until(deadline, self._connect())
+                if success:
                     self._connected = True
+                    self._connection.set_connected()
+                else:
+                    self._connected = False
+                    self.invalidate(CACHE_AUTH, CACHE_DEVICELIST, CACHE_DEVICE_INFO)
+                    delay = self._connection.connect_failed()
+                    # Only the first failure in a row is worth a log entry
+                    log = _LOGGER.debug
+                    if self._connection.failures == 1:
+                        log = _LOGGER.warning
+                    log("Failed to connect to %s, retry in %.0f s", self.liveid, delay)
+            else:
+                self._connected = False
 
         if self.available and self.connected:
-            await self._update_console_status()
-            await self._update_media_status()
-            await self._update_volume_controls()
+            # The event stream keeps the statuses current while it is up
+            updates = [self._update_volume_controls()]
+            if not self._push_connected:
+                updates += [self._update_console_status(), self._update_media_status()]
+            await self._run_until(deadline, *updates)
+            # Depends on the statuses above to detect a title/session change
+            await self._run_until(deadline, self._update_media_commands())
+
+
+class XboxOneState:
+    """
+    Immutable snapshot of everything the entity reports.
+
+    Built once per refresh or pushed update, so a state write is a series of
+    attribute reads instead of rescanning the raw console and media status.
+    """
+
+    __slots__ = (
+        "server_available",
+        "available",
+        "connected",
+        "state",
+        "supported_features",
+        "active_app",
+        "active_app_image",
+        "active_app_type",
+        "media_content_type",
+        "media_duration",
+        "media_position",
+        "media_position_updated_at",
+        "media_title",
+        "source_list",
+    )
+
+    def __init__(self, xboxone, previous=None):
+        focused = xboxone.focused_title or {}
+        active_app = focused.get("name")
+        active_app_type = focused.get("type")
+        in_app = active_app_type in ["Application", "App"] and active_app != "Home"
+
+        playback_state = PLAYBACK_STATES.get(xboxone.media_playback_state)
+        if playback_state:
+            state = playback_state
+        elif xboxone.connected or xboxone.available:
+            if active_app_type in ["Application", "App", "Game"] or active_app == "Home":
+                state = STATE_ON
+            else:
+                state = STATE_UNKNOWN
+        else:
+            state = STATE_OFF
+        playing = state in [STATE_PLAYING, STATE_PAUSED]
+
+        supported_features = SUPPORT_XBOXONE
+        if not playing and not in_app:
+            supported_features &= ~SUPPORT_NEXT_TRACK & ~SUPPORT_PREVIOUS_TRACK
+        if not xboxone.volume_controls:
+            supported_features &= ~SUPPORT_VOLUME_MUTE & ~SUPPORT_VOLUME_STEP
+
+        media_title = xboxone.media_title if playing else active_app
+
+        # Keep the previous sample while playback is where it was expected to
+        # be, so steady playback does not count as a change
+        position = xboxone.media_position if playing else None
+        position_updated_at = xboxone.media_status_sampled_at if playing else None
+        if (
+            position is not None
+            and position_updated_at is not None
+            and previous is not None
+            and previous.media_position is not None
+            and previous.media_position_updated_at is not None
+            and previous.state == state
+            and previous.media_title == media_title
+        ):
+            expected = previous.media_position
+            if state == STATE_PLAYING:
+                expected += (
+                    position_updated_at - previous.media_position_updated_at
+                ).total_seconds()
+            if abs(position - expected) <= MEDIA_POSITION_TOLERANCE:
+                position = previous.media_position
+                position_updated_at = previous.media_position_updated_at
+
+        init = partial(object.__setattr__, self)
+        init("server_available", xboxone.server_available)
+        init("available", xboxone.available)
+        init("connected", xboxone.connected)
+        init("state", state)
+        init("supported_features", supported_features)
+        init("active_app", active_app)
+        init("active_app_image", focused.get("image") or None)
+        init("active_app_type", active_app_type)
+        init(
+            "media_content_type",
+            MEDIA_CONTENT_TYPES.get(xboxone.media_type) if playing else None,
+        )
+        init("media_duration", xboxone.media_duration if playing else None)
+        init("media_position", position)
+        init("media_position_updated_at", position_updated_at)
+        init("media_title", media_title)
+        init("source_list", list(xboxone.all_apps))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, XboxOneState):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+@callback
+def async_get_thumbnail_cache(hass):
+    """Return the thumbnail cache shared by every console"""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_THUMBNAILS not in data:
+        data[DATA_THUMBNAILS] = ThumbnailCache(hass, hass.config.path(THUMBNAIL_DIR))
+    return data[DATA_THUMBNAILS]
+
+
+class ThumbnailCache:
+    """
+    Size bounded LRU cache of images, in memory and on disk.
+
+    Entries are keyed by the sha256 of the image url, which is also the file
+    name on disk. A file starts with a line holding the content type, and
+    file mtimes track recency of use.
+    """
+
+    def __init__(
+        self,
+        hass,
+        path,
+        memory_limit=THUMBNAIL_MEMORY_LIMIT,
+        disk_limit=THUMBNAIL_DISK_LIMIT,
+    ):
+        self._hass = hass
+        self._path = path
+        self._memory_limit = memory_limit
+        self._disk_limit = disk_limit
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._in_flight = {}
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    async def async_get(self, url, fetch):
+        """
+        Return (content, content_type) of url, calling fetch(url) on a miss.
+
+        Concurrent misses for the same url share one fetch.
+        """
+        key = self._key(url)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = self._hass.loop.create_task(
+                self._async_load(key, url, fetch)
+            )
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _async_load(self, key, url, fetch):
+        image = await self._hass.async_add_executor_job(self._read, key)
+        if image is None:
+            image = await fetch(url)
+            if not image or image[0] is None:
+                return None, None
+            await self._hass.async_add_executor_job(self._write, key, *image)
+
+        self._remember(key, image)
+        return image
+
+    def _remember(self, key, image):
+        size = len(image[0])
+        if size > self._memory_limit:
+            return
+        self._memory[key] = image
+        self._memory_size += size
+        while self._memory_size > self._memory_limit:
+            _, (content, _) = self._memory.popitem(last=False)
+            self._memory_size -= len(content)
+
+    def _read(self, key):
+        """Read a cached image from disk, runs in the executor"""
+        file_path = os.path.join(self._path, key)
+        try:
+            with open(file_path, "rb") as file:
+                content_type = file.readline().rstrip(b"\n").decode()
+                content = file.read()
+            os.utime(file_path)
+        except (OSError, UnicodeDecodeError):
+            return None
+        return content, content_type or None
+
+    def _write(self, key, content, content_type):
+        """Write an image to disk and evict the least recently used, executor"""
+        try:
+            os.makedirs(self._path, exist_ok=True)
+            with open(os.path.join(self._path, key), "wb") as file:
+                file.write((content_type or "").encode() + b"\n")
+                file.write(content)
+
+            entries = []
+            for entry in os.scandir(self._path):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self._disk_limit:
+                    break
+                os.remove(path)
+                total -= size
+        except OSError as err:
+            _LOGGER.warning("Unable to cache thumbnail: %s", err)
 
 
 class XboxOneDevice(MediaPlayerEntity):
     """Representation of an Xbox One device on the network."""
 
-    def __init__(self, hass, base_url, liveid, ip, name, auth):
+    def __init__(
+        self,
+        hass,
+        base_url,
+        liveid,
+        ip,
+        name,
+        auth,
+        cache_ttl=None,
+        push=False,
+        poll_interval=None,
+        metrics=False,
+        servers=None,
+    ):
         """Initialize the Xbox One device."""
-        self._xboxone = XboxOne(hass, base_url, liveid, ip, auth)
+        self._xboxone = XboxOne(
+            hass,
+            base_url,
+            liveid,
+            ip,
+            auth,
+            cache_ttl,
+            push,
+            poll_interval,
+            metrics,
+            servers,
+        )
+        self._cancel_poll = None
+        self._polling = False
+        # Not left running while Home Assistant stops
+        self._poll_job = HassJob(self._async_poll, cancel_on_shutdown=True)
+        self._push_connected = False
         self._name = name
         self._liveid = liveid
-        self._state = STATE_UNKNOWN
-        self._running_apps = None
-        self._current_app = None
 
     @property
     def name(self):
@@ -510,97 +1896,146 @@ class XboxOneDevice(MediaPlayerEntity):
         """Console Live ID"""
         return self._liveid
 
+    @property
+    def available(self):
+        """Unavailable while the REST server's circuit breaker is open."""
+        return self._xboxone.snapshot.server_available
+
     @property
     def should_poll(self):
-        """Device should be polled."""
-        return True
+        """Polling is scheduled by the entity so unchanged polls write nothing."""
+        return False
+
+    async def async_added_to_hass(self):
+        """Start polling and subscribe to push updates."""
+        self.async_on_remove(self._xboxone.async_add_listener(self._async_pushed))
+        await self._xboxone.async_load_apps()
+        for coordinator in self._xboxone.coordinators:
+            self.async_on_remove(coordinator.async_register(self._xboxone))
+        self.async_on_remove(self._async_stop_polling)
+        self._polling = True
+        self._async_schedule_poll(0)
+        self._xboxone.async_start_push()
+
+    @callback
+    def _async_pushed(self):
+        """Write pushed state, poll right away when the stream dropped."""
+        self.async_write_ha_state()
+        if self._push_connected and not self._xboxone.push_connected:
+            self._async_schedule_poll(0)
+        self._push_connected = self._xboxone.push_connected
+
+    @callback
+    def _async_stop_polling(self):
+        self._polling = False
+        self._async_cancel_poll()
+
+    @callback
+    def _async_cancel_poll(self):
+        if self._cancel_poll is not None:
+            self._cancel_poll()
+            self._cancel_poll = None
+
+    @callback
+    def _async_schedule_poll(self, delay=None):
+        """Schedule the next poll, by default after the adaptive interval."""
+        self._async_cancel_poll()
+        if not self._polling:
+            return
+        if delay is None:
+            delay = self._xboxone.poll_interval
+        self._cancel_poll = async_call_later(self.hass, delay, self._poll_job)
+
+    async def _async_poll(self, now=None):
+        """Refresh, writing state only when something visible changed."""
+        self._cancel_poll = None
+        try:
+            if await self._xboxone.refresh():
+                self.async_write_ha_state()
+        finally:
+            if self._cancel_poll is None:
+                self._async_schedule_poll()
+
+    def _queue_command(self, command, *args, step=False):
+        """Queue a console command and poll soon to pick up its effect."""
+        future = self._xboxone.queue_command(command, *args, step=step)
+        self._async_schedule_poll()
+        return future
+
+    async def async_will_remove_from_hass(self):
+        """
+        Close the push update stream and stop following a power on.
+
+        The console is already unregistered from its REST servers, the ones no
+        other console uses are released.
+        """
+        await self._xboxone.async_stop_push()
+        await self._xboxone.async_cancel_poweron()
+        await async_release_coordinators(self.hass)
 
     @property
     def supported_features(self):
         """Flag media player features that are supported."""
-        active_support = SUPPORT_XBOXONE
-        if self.state not in [STATE_PLAYING, STATE_PAUSED] and (
-            self._xboxone.active_app_type not in ["Application", "App"]
-            or self._xboxone.active_app == "Home"
-        ):
-            active_support &= ~SUPPORT_NEXT_TRACK & ~SUPPORT_PREVIOUS_TRACK
-        if not self._xboxone.volume_controls:
-            active_support &= ~SUPPORT_VOLUME_MUTE & ~SUPPORT_VOLUME_STEP
-        return active_support
+        return self._xboxone.snapshot.supported_features
 
     @property
     def state(self):
         """Return the state of the player."""
-        playback_state = {
-            "Closed": STATE_IDLE,
-            "Changing": STATE_IDLE,
-            "Stopped": STATE_IDLE,
-            "Playing": STATE_PLAYING,
-            "Paused": STATE_PAUSED,
-        }.get(self._xboxone.media_playback_state)
-
-        if playback_state:
-            state = playback_state
-        elif self._xboxone.connected or self._xboxone.available:
-            if (
-                self._xboxone.active_app_type in ["Application", "App", "Game"]
-                or self._xboxone.active_app == "Home"
-            ):
-                state = STATE_ON
-            else:
-                state = STATE_UNKNOWN
-        else:
-            state = STATE_OFF
-
-        return state
+        return self._xboxone.snapshot.state
 
     @property
     def media_content_type(self):
         """Media content type"""
-        if self.state in [STATE_PLAYING, STATE_PAUSED]:
-            return {"Music": MEDIA_TYPE_MUSIC, "Video": MEDIA_TYPE_VIDEO}.get(
-                self._xboxone.media_type
-            )
+        return self._xboxone.snapshot.media_content_type
 
     @property
     def media_duration(self):
         """Duration in seconds"""
-        if self.state in [STATE_PLAYING, STATE_PAUSED]:
-            return self._xboxone.media_duration
+        return self._xboxone.snapshot.media_duration
 
     @property
     def media_position(self):
         """Position in seconds"""
-        if self.state in [STATE_PLAYING, STATE_PAUSED]:
-            return self._xboxone.media_position
+        return self._xboxone.snapshot.media_position
 
     @property
     def media_position_updated_at(self):
         """Last valid time of media position"""
-        if self.state in [STATE_PLAYING, STATE_PAUSED]:
-            return dt_util.utcnow()
+        return self._xboxone.snapshot.media_position_updated_at
 
     @property
     def media_image_url(self):
         """Image url of current playing media."""
-        return self._xboxone.active_app_image
+        return self._xboxone.snapshot.active_app_image
+
+    @property
+    def media_image_remotely_accessible(self):
+        """Serve images through the Home Assistant image proxy."""
+        return False
+
+    async def async_get_media_image(self):
+        """Fetch the image of the current title through the thumbnail cache."""
+        url = self.media_image_url
+        if url is None:
+            return None, None
+        return await async_get_thumbnail_cache(self.hass).async_get(
+            url, self._async_fetch_image
+        )
 
     @property
     def media_title(self):
         """When media is playing, print title (if any) - otherwise, print app name"""
-        if self.state in [STATE_PLAYING, STATE_PAUSED]:
-            return self._xboxone.media_title
-        return self._xboxone.active_app
+        return self._xboxone.snapshot.media_title
 
     @property
     def source(self):
         """Return the current app."""
-        return self._xboxone.active_app
+        return self._xboxone.snapshot.active_app
 
     @property
     def source_list(self):
         """Return a list of running apps."""
-        return list(self._xboxone.all_apps.keys())
+        return self._xboxone.snapshot.source_list
 
     async def async_update(self):
         """Get the latest date and update device state."""
@@ -608,53 +2043,67 @@ class XboxOneDevice(MediaPlayerEntity):
 
     async def async_turn_on(self):
         """Turn on the device."""
-        await self._xboxone.poweron()
+        await self._queue_command(self._xboxone.poweron)
 
-    async def turn_off(self):
+    async def async_turn_off(self):
         """Turn off the device."""
-        await self._xboxone.poweroff()
+        await self._queue_command(self._xboxone.poweroff)
 
     async def async_mute_volume(self, mute):
         """Mute the volume."""
-        await self._xboxone.volume_command("mute")
+        await self._queue_command(self._xboxone.volume_command, "mute")
 
     async def async_volume_up(self):
-        """Turn volume up for media player."""
-        await self._xboxone.volume_command("up")
+        """Turn volume up for media player, without waiting for delivery."""
+        self._queue_command(self._xboxone.volume_command, "up", step=True)
 
     async def async_volume_down(self):
-        """Turn volume down for media player."""
-        await self._xboxone.volume_command("down")
+        """Turn volume down for media player, without waiting for delivery."""
+        self._queue_command(self._xboxone.volume_command, "down", step=True)
 
     async def async_media_play(self):
         """Send play command."""
-        await self._xboxone.media_command("play")
+        await self._queue_command(self._xboxone.media_command, "play")
 
     async def async_media_pause(self):
         """Send pause command."""
-        await self._xboxone.media_command("pause")
+        await self._queue_command(self._xboxone.media_command, "pause")
 
     async def async_media_stop(self):
-        await self._xboxone.media_command("stop")
+        await self._queue_command(self._xboxone.media_command, "stop")
 
     async def async_media_play_pause(self):
         """Send play/pause command."""
-        await self._xboxone.media_command("play_pause")
+        await self._queue_command(self._xboxone.media_command, "play_pause")
 
     async def async_media_previous_track(self):
         """Send previous track command."""
-        if self._xboxone.active_app == "TV":
-            await self._xboxone.ir_command("stb", "btn.ch_down")
+        if self._xboxone.snapshot.active_app == "TV":
+            self._queue_command(
+                self._xboxone.ir_command, "stb", "btn.ch_down", step=True
+            )
         else:
-            await self._xboxone.media_command("prev_track")
+            await self._queue_command(
+                self._xboxone.media_command, "prev_track"
+            )
 
     async def async_media_next_track(self):
         """Send next track command."""
-        if self._xboxone.active_app == "TV":
-            await self._xboxone.ir_command("stb", "btn.ch_up")
+        if self._xboxone.snapshot.active_app == "TV":
+            self._queue_command(
+                self._xboxone.ir_command, "stb", "btn.ch_up", step=True
+            )
         else:
-            await self._xboxone.media_command("next_track")
+            await self._queue_command(
+                self._xboxone.media_command, "next_track"
+            )
 
     async def async_select_source(self, source):
         """Select input source."""
-        await self._xboxone.launch_title(source)
+        await self._queue_command(self._xboxone.launch_title, source)
+
+    async def async_send_sequence(self, steps):
+        """Run a sequence of console commands, returning per step timings."""
+        result = await self._xboxone.send_sequence(steps)
+        self._async_schedule_poll()
+        return result
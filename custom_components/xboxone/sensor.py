@@ -0,0 +1,111 @@
+"""
+Diagnostic sensors of the REST server requests made for an Xbox One
+
+Loaded by the media_player platform when `metrics` is enabled.
+"""
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import CONF_DEVICE, CONF_NAME
+from homeassistant.helpers.entity import EntityCategory
+
+from .const import DATA_COORDINATORS, DOMAIN, ENTRY_SCHEMA
+from .coordinator import async_get_coordinator, get_base_urls
+
+SENSOR_TYPES = {
+    "requests": ("Requests", None, SensorStateClass.TOTAL_INCREASING),
+    "errors": ("Request errors", None, SensorStateClass.TOTAL_INCREASING),
+    "latency": ("Request latency", "ms", SensorStateClass.MEASUREMENT),
+    "refresh": ("Refresh duration", "ms", SensorStateClass.MEASUREMENT),
+}
+
+
+def _create_sensors(hass, base_urls, liveid, name):
+    for base_url in base_urls:
+        async_get_coordinator(hass, base_url).enable_metrics()
+    return [
+        XboxOneMetricSensor(base_urls, liveid, name, sensor_type)
+        for sensor_type in SENSOR_TYPES
+    ]
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    if discovery_info is None:
+        return
+
+    async_add_entities(
+        _create_sensors(
+            hass,
+            discovery_info["base_urls"],
+            discovery_info[CONF_DEVICE],
+            discovery_info[CONF_NAME],
+        ),
+        True,
+    )
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    config = ENTRY_SCHEMA({**entry.data, **entry.options})
+    async_add_entities(
+        _create_sensors(
+            hass, get_base_urls(config), config[CONF_DEVICE], config[CONF_NAME]
+        ),
+        True,
+    )
+
+
+class XboxOneMetricSensor(SensorEntity):
+    """
+    A request metric of one console.
+
+    Requests are counted over every REST server of the console, standby ones
+    included, but only those made for this console. The per-endpoint
+    breakdown is left to the diagnostics, as attributes it would be recorded
+    again on every update.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, base_urls, liveid, name, sensor_type):
+        self._base_urls = base_urls
+        self._liveid = liveid
+        self._type = sensor_type
+        self._name = f"{name} {SENSOR_TYPES[sensor_type][0]}"
+        self._attr_native_unit_of_measurement = SENSOR_TYPES[sensor_type][1]
+        self._attr_state_class = SENSOR_TYPES[sensor_type][2]
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def unique_id(self):
+        return f"{self._liveid}_{self._type}"
+
+    def _metrics(self):
+        """Metrics of the console's servers, primary first"""
+        coordinators = self.hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {})
+        for base_url in self._base_urls:
+            coordinator = coordinators.get(base_url)
+            yield coordinator.metrics if coordinator is not None else None
+
+    async def async_update(self):
+        metrics = list(self._metrics())
+        value = None
+        if self._type == "refresh":
+            primary = metrics[0]
+            refresh = primary.refreshes.get(self._liveid) if primary else None
+            value = None if refresh is None else round(refresh["last"] * 1000, 1)
+        else:
+            consoles = [
+                server.consoles[self._liveid]
+                for server in metrics
+                if server is not None and self._liveid in server.consoles
+            ]
+            requests = sum(console["requests"] for console in consoles)
+            if self._type == "requests":
+                value = requests
+            elif self._type == "errors":
+                value = sum(console["errors"] for console in consoles)
+            elif self._type == "latency" and requests:
+                latency = sum(console["latency_total"] for console in consoles)
+                value = round(latency / requests * 1000, 1)
+        self._attr_native_value = value
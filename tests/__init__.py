@@ -0,0 +1 @@
+"""Tests for the Xbox One integration"""
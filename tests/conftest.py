@@ -0,0 +1,54 @@
+"""Fixtures of the Xbox One tests, run against benchmarks/fake_server.py"""
+import pytest
+
+from benchmarks.fake_server import FakeSmartGlassServer
+from custom_components.xboxone.coordinator import async_release_coordinators
+from custom_components.xboxone.media_player import XboxOne
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture
+async def start_server(socket_enabled):
+    """Start a fake REST server, stopped after the test"""
+    servers = []
+
+    async def start(server_class=FakeSmartGlassServer, **kwargs):
+        server = server_class(**kwargs)
+        await server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        await server.stop()
+
+
+@pytest.fixture
+async def create_xboxone(hass):
+    """Create an XboxOne for the first console of a fake server"""
+    xboxones = []
+
+    def create(server, servers=(), **kwargs):
+        xboxone = XboxOne(
+            hass,
+            server.base_url,
+            server.consoles[0],
+            "",
+            True,
+            servers=[standby.base_url for standby in servers],
+            **kwargs,
+        )
+        xboxones.append(xboxone)
+        return xboxone
+
+    yield create
+    for xboxone in xboxones:
+        await xboxone.async_stop_push()
+        for coordinator in xboxone.coordinators:
+            coordinator.consoles.clear()
+    await async_release_coordinators(hass)
+    await hass.async_block_till_done()
@@ -0,0 +1,201 @@
+"""Tests of the REST server coordinator and its helpers"""
+import asyncio
+from datetime import timedelta
+
+from aiohttp import web
+import homeassistant.util.dt as dt_util
+
+from benchmarks.fake_server import FakeSmartGlassServer
+from custom_components.xboxone.coordinator import (
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    NOT_MODIFIED,
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    AuthManager,
+    CircuitBreaker,
+    RequestScheduler,
+    async_get_coordinator,
+    extract_fields,
+)
+
+MEDIA_STATUS = "/device/<liveid>/media_status"
+
+
+class FailingMediaStatusServer(FakeSmartGlassServer):
+    """Answers the media status with a failure"""
+
+    async def _media_status(self, request):
+        return web.json_response({"success": False, "message": "Not connected"})
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_extract_fields():
+    data = {
+        "name": "Netflix",
+        "image": "https://example.com/netflix.png",
+        "titles": [{"name": "Home", "aum": "x"}, {"name": "Netflix", "aum": "y"}],
+        "metadata": {"title": "Some Episode", "description": "long"},
+    }
+    fields = {"name": None, "titles": {"name": None}, "metadata": {"*": None}}
+
+    assert extract_fields(data, fields) == {
+        "name": "Netflix",
+        "titles": [{"name": "Home"}, {"name": "Netflix"}],
+        "metadata": {"title": "Some Episode", "description": "long"},
+    }
+    assert extract_fields([data], {"name": None}) == [{"name": "Netflix"}]
+    assert extract_fields("scalar", fields) == "scalar"
+
+
+async def test_scheduler_runs_commands_first(hass):
+    scheduler = RequestScheduler(hass, limit=2)
+    await scheduler.acquire(PRIORITY_POLL)
+
+    started = []
+
+    async def request(priority, name):
+        await scheduler.acquire(priority)
+        started.append(name)
+
+    for priority, name in (
+        (PRIORITY_BACKGROUND, "background"),
+        (PRIORITY_POLL, "poll"),
+        (PRIORITY_COMMAND, "command"),
+    ):
+        hass.async_create_task(request(priority, name))
+    await _settle()
+
+    # The last free slot is kept for commands
+    assert started == ["command"]
+    assert scheduler.as_dict()["queued"] == {"poll": 1, "background": 1}
+
+    scheduler.release()
+    await _settle()
+    assert started == ["command"]
+
+    scheduler.release()
+    await _settle()
+    assert started == ["command", "poll"]
+
+    scheduler.release()
+    await _settle()
+    assert started == ["command", "poll", "background"]
+
+    scheduler.release()
+    assert scheduler.as_dict()["active"] == 0
+
+
+async def test_breaker_opens_and_probes(hass):
+    breaker = CircuitBreaker(hass, threshold=2, reset_timeout=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+
+    await asyncio.sleep(0.06)
+    assert breaker.state == BREAKER_HALF_OPEN
+    # A single probe is let through
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.trips == 1
+
+    await asyncio.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.failures == 0
+
+
+async def test_breaker_trips_on_dead_server(hass, start_server):
+    server = await start_server()
+    coordinator = async_get_coordinator(hass, server.base_url)
+    await server.stop()
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        assert await coordinator.get("/versions") == {}
+    assert coordinator.breaker.state == BREAKER_OPEN
+
+    assert await coordinator.get("/versions") == {}
+    assert coordinator.breaker.rejected == 1
+
+
+def test_token_lifetime():
+    now = dt_util.utcnow()
+    response = {
+        "tokens": {
+            "expired": {"date_valid": (now - timedelta(hours=1)).isoformat()},
+            "user": {"date_valid": (now + timedelta(hours=2)).isoformat()},
+            "xsts": {
+                "date_valid": (now + timedelta(hours=1))
+                .replace(tzinfo=None)
+                .isoformat()
+            },
+            "no_date": {},
+            "invalid": {"date_valid": "tomorrow"},
+        }
+    }
+
+    lifetime = AuthManager._token_lifetime(response)
+    assert 3590 < lifetime <= 3600
+    assert AuthManager._token_lifetime({"tokens": {}}) is None
+    assert AuthManager._token_lifetime({}) is None
+
+
+async def test_etag_answers_not_modified(hass, start_server):
+    server = await start_server(etag=True)
+    coordinator = async_get_coordinator(hass, server.base_url)
+    coordinator.enable_metrics()
+    endpoint = f"/device/{server.consoles[0]}/media_status"
+    validator = {}
+
+    response = await coordinator.get(endpoint, template=MEDIA_STATUS, validator=validator)
+    assert response["media_status"]["playback_status"] == "Playing"
+    assert validator["etag"]
+
+    response = await coordinator.get(endpoint, template=MEDIA_STATUS, validator=validator)
+    assert response is NOT_MODIFIED
+    assert server.requests[MEDIA_STATUS] == 2
+    assert coordinator.metrics.endpoints[MEDIA_STATUS]["status"][304] == 1
+
+
+async def test_unchanged_body_answers_not_modified(hass, start_server):
+    server = await start_server()
+    coordinator = async_get_coordinator(hass, server.base_url)
+    endpoint = f"/device/{server.consoles[0]}/media_status"
+    validator = {}
+
+    response = await coordinator.get(endpoint, validator=validator)
+    assert response["success"]
+    assert validator["digest"]
+    assert validator["etag"] is None
+
+    assert await coordinator.get(endpoint, validator=validator) is NOT_MODIFIED
+
+    # Without a validator the response is always parsed
+    assert await coordinator.get(endpoint) == response
+
+
+async def test_failure_is_not_validated(hass, start_server):
+    server = await start_server(FailingMediaStatusServer, etag=True)
+    coordinator = async_get_coordinator(hass, server.base_url)
+    endpoint = f"/device/{server.consoles[0]}/media_status"
+    validator = {}
+
+    for _ in range(2):
+        response = await coordinator.get(endpoint, validator=validator)
+        assert response == {"success": False, "message": "Not connected"}
+        assert validator == {}
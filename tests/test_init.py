@@ -0,0 +1,107 @@
+"""Tests of the setup of the Xbox One integration"""
+from urllib.parse import urlsplit
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_DEVICE, CONF_HOST, CONF_NAME, CONF_PORT
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.xboxone.const import (
+    CONF_METRICS,
+    CONF_SERVERS,
+    DOMAIN,
+    STORAGE_KEY_APPS,
+)
+from custom_components.xboxone.diagnostics import async_get_config_entry_diagnostics
+
+
+def _server_config(server):
+    url = urlsplit(server.base_url)
+    return {CONF_HOST: url.hostname, CONF_PORT: url.port}
+
+
+async def test_entry_setup_and_removal(hass, hass_storage, start_server):
+    server = await start_server()
+    liveid = server.consoles[0]
+    key = STORAGE_KEY_APPS.format(liveid=liveid)
+    hass_storage[key] = {"version": 1, "key": key, "data": {}}
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=liveid,
+        data={
+            CONF_DEVICE: liveid,
+            CONF_NAME: "Xbox",
+            CONF_METRICS: True,
+            **_server_config(server),
+        },
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("media_player.xbox").state == "playing"
+    assert hass.states.get("sensor.xbox_requests") is not None
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
+
+
+async def test_yaml_platform_loads_sensors(hass, start_server):
+    server = await start_server()
+    config = {
+        "media_player": [
+            {
+                "platform": DOMAIN,
+                CONF_DEVICE: server.consoles[0],
+                CONF_NAME: "Xbox",
+                CONF_METRICS: True,
+                **_server_config(server),
+            }
+        ]
+    }
+
+    assert await async_setup_component(hass, "media_player", config)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.xbox_refresh_duration") is not None
+    await hass.async_stop()
+
+
+async def test_diagnostics_cover_the_entry_only(hass, start_server):
+    server = await start_server(consoles=2)
+    standby = await start_server(consoles=2)
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=liveid,
+            data={
+                CONF_DEVICE: liveid,
+                CONF_NAME: f"Xbox {index}",
+                CONF_METRICS: True,
+                **_server_config(server),
+            },
+            options={CONF_SERVERS: [standby.base_url]} if index == 0 else {},
+        )
+        for index, liveid in enumerate(server.consoles)
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entries[1])
+    assert diagnostics["config"][CONF_DEVICE] == "**REDACTED**"
+    assert len(diagnostics["rest_servers"]) == 1
+    rest_server = diagnostics["rest_servers"][0]
+    assert rest_server["base_url"] == "**REDACTED**"
+    assert rest_server["console"]["server"] == "**REDACTED**"
+    assert rest_server["metrics"]["console"]["requests"] > 0
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entries[0])
+    assert len(diagnostics["rest_servers"]) == 2
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
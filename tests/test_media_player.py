@@ -0,0 +1,157 @@
+"""Tests of the console client of the media player platform"""
+import asyncio
+from datetime import timedelta
+
+from aiohttp import web
+from homeassistant.const import STATE_PLAYING
+import homeassistant.util.dt as dt_util
+
+from benchmarks.fake_server import FakeSmartGlassServer
+from custom_components.xboxone import coordinator
+from custom_components.xboxone.media_player import (
+    CONNECTION_BACKOFF,
+    CONNECTION_CONNECTED,
+    CONNECTION_CONNECTING,
+    ConnectionStateMachine,
+    XboxOne,
+    XboxOneState,
+)
+
+MEDIA_COMMAND = "/device/<liveid>/media/{command}"
+VOLUME_UP = "/device/<liveid>/ir/{device}/{button}"
+
+
+class SlowCommandServer(FakeSmartGlassServer):
+    """Media commands take longer than a request may"""
+
+    async def _success(self, request):
+        if "command" in request.match_info:
+            await asyncio.sleep(0.2)
+        return await super()._success(request)
+
+
+class RejectingCommandServer(FakeSmartGlassServer):
+    """Media commands are refused"""
+
+    async def _success(self, request):
+        if "command" in request.match_info:
+            return web.json_response({"success": False})
+        return await super()._success(request)
+
+
+def _playing(xboxone, position, sampled_at):
+    xboxone._available = xboxone._connected = True
+    xboxone._console_status = {
+        "active_titles": [{"name": "Netflix", "type": "Application", "has_focus": True}]
+    }
+    xboxone._media_status = {
+        "playback_status": "Playing",
+        "position": int(position * 10000000),
+        "metadata": {"title": "Some Episode"},
+    }
+    xboxone._media_status_sampled_at = sampled_at
+
+
+async def test_failover(hass, start_server, create_xboxone):
+    primary = await start_server(latency=0.05)
+    standby = await start_server(latency=0.005)
+    xboxone = create_xboxone(primary, servers=[standby])
+
+    for _ in range(3):
+        await xboxone.refresh()
+    # The faster server is preferred once its latency is known
+    assert xboxone.coordinator.base_url == standby.base_url
+    assert xboxone.snapshot.state == STATE_PLAYING
+
+    await standby.stop()
+    primary.requests.clear()
+    await xboxone.refresh()
+
+    assert xboxone.coordinator.base_url == primary.base_url
+    assert xboxone.available
+    assert xboxone.snapshot.state == STATE_PLAYING
+    assert primary.requests["/device/<liveid>/media_status"] == 1
+
+
+async def test_position_within_tolerance_is_kept(hass):
+    xboxone = XboxOne(hass, "http://127.0.0.1:1", "FD00000000000000", "", True)
+    sampled_at = dt_util.utcnow()
+    _playing(xboxone, 100, sampled_at)
+    previous = XboxOneState(xboxone)
+
+    # Playback went on as expected
+    _playing(xboxone, 111, sampled_at + timedelta(seconds=10))
+    state = XboxOneState(xboxone, previous)
+    assert state.media_position == 100
+    assert state.media_position_updated_at == sampled_at
+
+    # Playback was seeked
+    _playing(xboxone, 200, sampled_at + timedelta(seconds=10))
+    state = XboxOneState(xboxone, previous)
+    assert state.media_position == 200
+    assert state.media_position_updated_at == sampled_at + timedelta(seconds=10)
+
+
+async def test_connection_backoff(hass):
+    connection = ConnectionStateMachine(hass, base_delay=10, max_delay=60)
+
+    assert connection.may_connect()
+    assert connection.state == CONNECTION_CONNECTING
+    delay = connection.connect_failed()
+    assert 5 <= delay <= 10
+    assert connection.state == CONNECTION_BACKOFF
+    assert not connection.may_connect()
+
+    assert 10 <= connection.connect_failed() <= 20
+    assert connection.failures == 2
+
+    connection.reset_backoff()
+    assert connection.may_connect()
+    connection.set_connected()
+    assert connection.state == CONNECTION_CONNECTED
+    assert connection.failures == 0
+    assert connection.as_dict()["transitions"][CONNECTION_BACKOFF] == 1
+
+
+async def test_step_commands_are_coalesced(hass, start_server, create_xboxone):
+    server = await start_server()
+    xboxone = create_xboxone(server)
+    await xboxone.refresh()
+
+    futures = [
+        xboxone.queue_command(xboxone.volume_command, "up", step=True)
+        for _ in range(3)
+    ]
+    futures.append(xboxone.queue_command(xboxone.media_command, "play"))
+    responses = await asyncio.gather(*futures)
+
+    assert all(response["success"] for response in responses)
+    assert server.requests[VOLUME_UP] == 3
+    assert server.requests[MEDIA_COMMAND] == 1
+    stats = xboxone.command_stats
+    assert stats["commands"] == 4
+    assert stats["batches"] == 2
+    assert stats["coalesced"] == 2
+
+
+async def test_unanswered_command_is_not_resent(
+    hass, start_server, create_xboxone, monkeypatch
+):
+    monkeypatch.setattr(coordinator, "REQUEST_TIMEOUT", 0.1)
+    server = await start_server(SlowCommandServer)
+    xboxone = create_xboxone(server)
+    await xboxone.refresh()
+
+    assert await xboxone.media_command("play") is None
+    # Let the server finish the abandoned request
+    await asyncio.sleep(0.2)
+    assert server.requests[MEDIA_COMMAND] == 1
+
+
+async def test_rejected_command_is_retried_once(hass, start_server, create_xboxone):
+    server = await start_server(RejectingCommandServer)
+    xboxone = create_xboxone(server)
+    await xboxone.refresh()
+
+    assert await xboxone.media_command("play") is None
+    assert server.requests[MEDIA_COMMAND] == 2